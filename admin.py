@@ -0,0 +1,152 @@
+# admin.py — jelszóval védett, automatikusan frissülő eredmény-nézet (?admin=1)
+# - döntés (decision_choice / decision_count) csoportonként (text / visual)
+# - Likert-blokkok átlagai, beküldési ütem
+# - növekményes összesítés: frissítéskor csak az előző óta érkezett sorokat olvassa be
+
+import hmac
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+
+import streamlit as st
+
+from storage import SeqCursor
+from survey import ITEMS, LIKERT
+
+# a Likert-blokkok: azok a kérdéscsoportok, amelyek minden tétele 1–10 skálás
+LIKERT_BLOCKS = {}
+for _it in ITEMS:
+    if _it.group and _it.options == LIKERT:
+        LIKERT_BLOCKS.setdefault(_it.group, []).append(_it.id)
+
+
+class ResultsAggregator:
+    """Folyamatszintű, növekményesen frissülő összesítő a válasz-tár fölött."""
+
+    def __init__(self):
+        self.cursor = SeqCursor()
+        self.total = 0
+        self.by_group = defaultdict(int)
+        self.choice = defaultdict(lambda: defaultdict(int))   # csoport -> választás -> db
+        self.count = defaultdict(lambda: defaultdict(int))    # csoport -> elfogadható db -> db
+        self.block_sum = defaultdict(lambda: defaultdict(float))  # csoport -> blokk -> összeg
+        self.block_n = defaultdict(lambda: defaultdict(int))
+        self.per_hour = defaultdict(int)
+        self.recent = deque()  # az elmúlt 24 óra beküldési időpontjai (epoch)
+        self._lock = threading.Lock()
+
+    def update(self, store) -> int:
+        """Az utolsó frissítés óta mentett sorok feldolgozása; visszaadja a számukat."""
+        with self._lock:
+            n = 0
+            for _, row in self.cursor.read(store):
+                self._add(row)
+                n += 1
+            cutoff = time.time() - 24 * 3600
+            while self.recent and self.recent[0] < cutoff:
+                self.recent.popleft()
+            return n
+
+    def _add(self, row):
+        group = row.get("group") or "?"
+        self.total += 1
+        self.by_group[group] += 1
+        self.choice[group][str(row.get("decision_choice"))] += 1
+        self.count[group][str(row.get("decision_count"))] += 1
+        for block, ids in LIKERT_BLOCKS.items():
+            for item_id in ids:
+                v = row.get(item_id)
+                if isinstance(v, (int, float)):
+                    self.block_sum[group][block] += v
+                    self.block_n[group][block] += 1
+        submitted = row.get("submitted_at")
+        if submitted:
+            ts = datetime.fromisoformat(submitted)
+            self.per_hour[ts.strftime("%Y-%m-%d %H:00")] += 1
+            self.recent.append(ts.timestamp())
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            groups = sorted(self.by_group)
+            now = time.time()
+            return {
+                "total": self.total,
+                "by_group": dict(self.by_group),
+                "choice": {g: dict(self.choice[g]) for g in groups},
+                "count": {g: dict(self.count[g]) for g in groups},
+                "block_means": {
+                    g: {b: round(self.block_sum[g][b] / self.block_n[g][b], 2)
+                        for b in self.block_n[g] if self.block_n[g][b]}
+                    for g in groups
+                },
+                "last_hour": sum(1 for t in self.recent if now - t <= 3600),
+                "per_hour": dict(sorted(self.per_hour.items())),
+            }
+
+
+def _password_ok() -> bool:
+    try:
+        expected = st.secrets["admin"]["password"]
+    except Exception:
+        st.error("Az admin nézet nincs beállítva ([admin] password a secrets.toml-ban).")
+        return False
+    if st.session_state.get("admin_ok"):
+        return True
+    pw = st.text_input("Jelszó", type="password", key="admin_pw")
+    if pw and hmac.compare_digest(pw, str(expected)):
+        st.session_state.admin_ok = True
+        return True
+    if pw:
+        st.error("Hibás jelszó.")
+    return False
+
+
+def render_admin(store, aggregator: ResultsAggregator, refresh_s: int = 15, startup: dict = None,
+                 admission: dict = None, assets: dict = None):
+    import pandas as pd
+    from streamlit_autorefresh import st_autorefresh
+
+    st.title("📊 Eredmények")
+    if not _password_ok():
+        return
+
+    st_autorefresh(interval=refresh_s * 1000, key="admin_refresh")
+    new_rows = aggregator.update(store)
+    snap = aggregator.snapshot()
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Kitöltések", snap["total"], delta=new_rows or None)
+    c2.metric("Utolsó órában", snap["last_hour"])
+    c3.metric("text / visual",
+              f"{snap['by_group'].get('text', 0)} / {snap['by_group'].get('visual', 0)}")
+
+    st.subheader("Melyik ajánlatot fogadná el?")
+    st.dataframe(pd.DataFrame(snap["choice"]).fillna(0).astype(int))
+
+    st.subheader("Hány ajánlatot tartott elfogadhatónak?")
+    st.dataframe(pd.DataFrame(snap["count"]).fillna(0).astype(int).sort_index())
+
+    st.subheader("Likert-blokkok átlaga (1–10)")
+    st.dataframe(pd.DataFrame(snap["block_means"]))
+
+    st.subheader("Beküldések óránként")
+    if snap["per_hour"]:
+        st.bar_chart(pd.Series(snap["per_hour"], name="beküldés"))
+
+    if admission:
+        limit = admission["max_active"] or "∞"
+        st.caption(f"Befogadás: {admission['active']} / {limit} aktív · {admission['waiting']} várakozik · "
+                   f"{admission['shed']} várakozó oldal · {admission['admitted']} beengedve")
+    if assets:
+        looked_up = assets["hits"] + assets["misses"]
+        rate = f"{assets['hits'] / looked_up:.0%}" if looked_up else "–"
+        st.caption(f"Gyorsítótár: {assets['items']} elem · {assets['bytes'] / 2**20:.1f} / "
+                   f"{assets['max_bytes'] / 2**20:.0f} MB · találati arány {rate} "
+                   f"({assets['hits']} / {assets['misses']}) · {assets['evictions']} kiszorítás")
+    if startup:
+        first, warm = startup.get("first_render_s"), startup.get("warmup_s")
+        st.caption(f"Hidegindítás: bemelegítés {'folyamatban' if warm is None else f'{warm} s'}"
+                   f" · első kérdőívoldal {'–' if first is None else f'{first} s'}")
+    st.caption(f"Automatikus frissítés {refresh_s} másodpercenként · "
+               f"utoljára: {time.strftime('%H:%M:%S')}")
@@ -0,0 +1,76 @@
+# admission.py — befogadás-szabályozás túlterheléskor
+# - legfeljebb max_active egyidejűleg aktív kitöltés (az utóbbi idle_s másodpercben futott)
+# - az új érkezők egy könnyű várakozó oldalt kapnak (kép és kérdőív nélkül), visszaszámlálással
+#   és automatikus újrapróbálkozással; érkezési sorrendben jutnak be
+# - a már megkezdett kitöltések mindig folytatódhatnak, akkor is, ha a korlát betelt
+# - folyamatonként számol (több app-folyamatnál a korlát folyamatonként értendő)
+
+import threading
+import time
+
+
+class AdmissionController:
+    """Aktív munkamenetek korlátja várakozási sorral; kulcs: a munkamenet folytatási tokenje."""
+
+    def __init__(self, max_active: int = 0, idle_s: float = 300, retry_s: float = 15):
+        self.max_active = max_active  # 0 = nincs korlát
+        self.idle_s = idle_s
+        self.retry_s = retry_s
+        self._active = {}   # token -> utolsó futás (monotonic)
+        self._waiting = {}  # token -> (érkezés, utolsó próbálkozás), érkezési sorrendben
+        self._lock = threading.Lock()
+        self.shed = 0       # kiszolgált várakozó oldalak száma
+        self.admitted = 0
+
+    def _prune(self, now):
+        for token in [t for t, seen in self._active.items() if now - seen > self.idle_s]:
+            del self._active[token]
+        # aki már nem próbálkozik újra (bezárta az oldalt), kikerül a sorból
+        stale = 2 * self.retry_s + 5
+        for token in [t for t, (_, seen) in self._waiting.items() if now - seen > stale]:
+            del self._waiting[token]
+
+    def touch(self, token):
+        """Megkezdett kitöltés futása: mindig mehet tovább, és aktívnak számít."""
+        with self._lock:
+            self._active[token] = time.monotonic()
+
+    def try_admit(self, token) -> tuple:
+        """Új érkező: (beengedve, helye a sorban 1-től, javasolt újrapróbálkozás mp-ben)."""
+        now = time.monotonic()
+        with self._lock:
+            if token in self._active:
+                self._active[token] = now
+                return True, 0, 0
+            if not self.max_active:
+                self._active[token] = now
+                self.admitted += 1
+                return True, 0, 0
+            self._prune(now)
+            arrived = self._waiting.get(token, (now, now))[0]
+            self._waiting[token] = (arrived, now)
+            position = 1 + sum(1 for t, (a, _) in self._waiting.items() if a < arrived and t != token)
+            free = self.max_active - len(self._active)
+            if position <= free:
+                del self._waiting[token]
+                self._active[token] = now
+                self.admitted += 1
+                return True, 0, 0
+            self.shed += 1
+            return False, position, self.retry_s
+
+    def release(self, token):
+        """Beküldés után a hely azonnal felszabadul."""
+        with self._lock:
+            self._active.pop(token, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._prune(time.monotonic())
+            return {
+                "max_active": self.max_active,
+                "active": len(self._active),
+                "waiting": len(self._waiting),
+                "shed": self.shed,
+                "admitted": self.admitted,
+            }
@@ -0,0 +1,55 @@
+# answers.py — munkamenetenkénti tömör válasz-tároló
+# - tételazonosító szerint (survey.ITEMS sorrendje), nem a teljes kérdésszöveg szerint
+# - zárt kérdésnél csak a választott lehetőség sorszáma: egy int8 tömbelem, -1 = nincs válasz
+# - a kérdésszöveg és a lehetőség értéke csak megjelenítéskor / exportkor kell
+
+import json
+from array import array
+
+from survey import ITEM_INDEX, ITEMS
+
+UNANSWERED = -1
+
+
+class AnswerSheet:
+    """Egy kitöltés válaszai fix elrendezésben: int8 kódok + a szöveges válaszok külön."""
+
+    __slots__ = ("codes", "texts")
+
+    def __init__(self):
+        self.codes = array("b", [UNANSWERED]) * len(ITEMS)
+        self.texts = {}  # tétel-azonosító -> szabad szöveges válasz
+
+    def set(self, item, value):
+        if item.widget == "text_area":
+            if value is None:
+                self.texts.pop(item.id, None)
+            else:
+                self.texts[item.id] = value
+            return
+        pos = ITEM_INDEX[item.id]
+        self.codes[pos] = UNANSWERED if value is None else item.options.index(value)
+
+    def get(self, item):
+        """A tárolt válasz a lehetőség eredeti értékeként (None, ha nincs)."""
+        if item.widget == "text_area":
+            return self.texts.get(item.id)
+        code = self.codes[ITEM_INDEX[item.id]]
+        return None if code == UNANSWERED else item.options[code]
+
+    def to_record(self) -> dict:
+        """Exporthoz: {tétel-azonosító: érték} minden tételre (megválaszolatlan: None)."""
+        return {it.id: self.get(it) for it in ITEMS}
+
+    def dump(self) -> tuple:
+        """Mentéshez (checkpoint): (kódok bájtként, szöveges válaszok JSON-ként)."""
+        return self.codes.tobytes(), json.dumps(self.texts, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, codes: bytes, texts: str):
+        sheet = cls()
+        if len(codes) != len(sheet.codes):
+            raise ValueError("A mentett válaszok nem illenek a jelenlegi kérdőívhez.")
+        sheet.codes = array("b", codes)
+        sheet.texts = json.loads(texts)
+        return sheet
@@ -4,1003 +4,625 @@
 # - vissza/előre gombok, haladásjelző, CSV-mentés
 # - nincsenek duplikált key-ek
 
+import time
+RUN_STARTED = time.perf_counter()  # az első megjelenítésig eltelt idő méréséhez
+
 import streamlit as st
-import pandas as pd
-import json, time, uuid, random
+import hmac, logging, random, threading, uuid
 from datetime import datetime
 from pathlib import Path
 
-import smtplib
-from email.mime.text import MIMEText
-import streamlit as st
+from admin import ResultsAggregator, render_admin
+from admission import AdmissionController
+from answers import AnswerSheet
+from assignment import GroupAssigner
+from assets import AssetCache
+from checkpoint import CheckpointStore, TokenOwners, new_token
+from events import EventLog
+from images import BASE_DIR, build_all, fallback_file, picture_html
+from metrics import METRICS_PATH, SurveyMetrics, process_path
+from notifier import EmailNotifier
+from profiling import RerunProfiler
+from storage import ResponseWriter, import_legacy_xlsx, open_store
+from survey import CAPTIONS, IMAGES, PAGES, TEXT_OFFERS, TOTAL_PAGES
+from timing import PageTimer
 
-def send_email_notification(record: dict):
-    try:
-        sender = st.secrets["email"]["address"]
-        password = st.secrets["email"]["password"]
-        receiver = st.secrets["email"]["address"]
-
-        subject = "Új kérdőív kitöltés érkezett"
-        body = f"Egy új válasz érkezett:\n\n{record}"
-
-        msg = MIMEText(body)
-        msg["Subject"] = subject
-        msg["From"] = sender
-        msg["To"] = receiver
-
-        with smtplib.SMTP("smtp.gmail.com", 587) as server:
-            server.starttls()
-            server.login(sender, password)
-            server.send_message(msg)
-    except Exception as e:
-        # Hibát is jelez a felületen, de ne dobja el a mentést
-        st.error(f"Email küldési hiba: {e}")
- 
 # ---------- ALAP ----------
 st.set_page_config(page_title="🧭 MI-ajánlások a fogyasztói döntésekben", page_icon="📝", layout="centered")
-DATA_PATH = Path("responses.xlsx")
-
-def save_row(row: dict):
-    """Append: egy sor mentése Excel (XLSX) fájlba, lapos táblázatként."""
-    flat = {}
-    for k, v in row.items():
-        if isinstance(v, dict):
-            for subk, subv in v.items():
-                flat[f"{k}_{subk}"] = subv
-        elif isinstance(v, list):
-            flat[k] = json.dumps(v, ensure_ascii=False)
-        else:
-            flat[k] = v
-
-    df_new = pd.DataFrame([flat])
-
-    if DATA_PATH.exists():
-        df_old = pd.read_excel(DATA_PATH, engine="openpyxl")
-        df_all = pd.concat([df_old, df_new], ignore_index=True)
-    else:
-        # ha még nincs fájl, akkor a df_all = df_new legyen
-        df_all = df_new
-
-    # fontos oszlopok sorrendje
-    id_cols = ["rid", "entered_at", "submitted_at", "group"]
-    time_cols = [f"duration_page_{i}" for i in range(1, 20)]
-    other_cols = [c for c in df_all.columns if c not in id_cols + time_cols]
-
-    # ha hiányzik valamelyik időoszlop, hozzuk létre
-    for col in time_cols:
-        if col not in df_all.columns:
-            df_all[col] = None
-
-    # új sorrend
-    df_all = df_all[id_cols + time_cols + other_cols]
-
-    df_all.to_excel(DATA_PATH, index=False, engine="openpyxl")
-
-  
-
-
-def progress_bar(current_page, total_pages):
-    st.progress(current_page / total_pages)
-
-def calc_durations(timestamps: dict, total_pages: int):
-    durations = {}
-    for page_num in range(total_pages + 1):  # 0..TOTAL_PAGES
-        key_entered = f"page_{page_num}_entered"
-        key_left = f"page_{page_num}_left"
-        if key_entered in timestamps and key_left in timestamps:
-            entered = datetime.fromisoformat(timestamps[key_entered])
-            left = datetime.fromisoformat(timestamps[key_left])
-            durations[page_num] = (left - entered).total_seconds()
-        else:
-            durations[page_num] = 0
-    return durations
-
-
-
-# ---------- SESSION ----------
-if "rid" not in st.session_state:
-    st.session_state.rid = str(uuid.uuid4())
-if "page" not in st.session_state:
-    st.session_state.page = 0
-if "entered_at" not in st.session_state:
-    st.session_state.entered_at = datetime.utcnow().isoformat()
-if "group" not in st.session_state:
-    st.session_state.group = random.choice(["text", "visual"])
-if "answers" not in st.session_state:
-    st.session_state.answers = {}
-if "timestamps" not in st.session_state:   # ⬅️ EZ AZ ÚJ RÉSZ
-    st.session_state.timestamps = {}
-page = st.session_state.page
-
-
-# ---------- DEFAULT VÁLTOZÓK ----------
-if "factors" not in st.session_state:
-    st.session_state.factors = {}
-
-if "experience" not in st.session_state:
-    st.session_state.experience = {}
-
-if "ai_influence" not in st.session_state:
-    st.session_state.ai_influence = None
-
-
-# minden oldal betöltésekor logoljuk a belépést
-st.session_state.timestamps[f"page_{page}_entered"] = datetime.utcnow().isoformat()
-
-# ---------- NAV FUNKCIÓ (felülírás) ----------
-
-
-
+DATA_PATH = Path("responses.sqlite3")  # alapértelmezett tár; [storage] url-lel felülírható
+log = logging.getLogger("appuj")
+
+@st.cache_resource
+def get_store():
+    """Folyamatszintű, minden munkamenet által közösen használt válasz-tár.
+
+    Több app-folyamathoz ([storage] url a secrets.toml-ban): egy közös SQLite fájl abszolút
+    útvonallal (sqlite:////srv/kerdoiv/responses.sqlite3) vagy postgresql://... URL;
+    a régi XLSX tárolás: xlsx:///responses.xlsx.
+    Az első megnyitáskor a korábban az élő responses.xlsx-be mentett sorok is átkerülnek.
+    """
+    try:
+        url = st.secrets["storage"]["url"]
+    except Exception:
+        url = DATA_PATH
+    store = open_store(url)
+    try:
+        import_legacy_xlsx(store)
+    except Exception:
+        # az app ettől még mehet; a következő indításkor újra megpróbálja
+        log.exception("A régi responses.xlsx átvétele sikertelen")
+    return store
 
-TOTAL_PAGES = 19  # 0..18
 
-# ---------- ANYAGOK (ajánlatok + skálák) ----------
-TEXT_OFFERS = {
-    "Prága":"""Egy 4 napos prágai utazást ajánlok Önnek, amely 3 éjszaka szállást tartalmaz egy belvárosi hotelben, reggelivel.  
-Az út során idegenvezető kíséretében fedezheti fel a Károly hidat, az Óváros teret és a prágai vár történelmi utcáit.  
-**Az ajánlat ára: 129 900 Ft/fő.**""",
-    "Barcelona":"""Ajánlok Önnek egy 4 napos barcelonai városlátogatást, amely 3 éjszakás szállást biztosít egy tengerpart közeli, 4 csillagos hotelben, reggelivel.  
-Az utazás során megcsodálhatja Gaudí ikonikus alkotásait, köztük a Sagrada Famíliát és a Güell parkot, valamint átélheti a mediterrán város vibráló hangulatát.  
-**Az ajánlat ára: 159 900 Ft/fő.**""",
-    "Róma":"""Szívesen ajánlok Önnek egy 4 napos római kirándulást, amely 3 éjszakás szállást tartalmaz egy központi elhelyezkedésű hotelben, reggelivel.  
-Az ajánlat része a belépő a Colosseumba és a Vatikáni Múzeumokba, így közvetlen közelről élheti át az örök város kulturális kincseit.  
-**Az ajánlat ára: 134 900 Ft/fő.**""",
-}
-
-IMAGES = {
-    # a képek az app.py-val EGY mappában legyenek (ékezet NÉLKÜL!)
-    "Prága": "praga.png",
-    "Barcelona": "barcelona.png",
-    "Róma": "roma.png",
-}
+@st.cache_resource
+def get_writer():
+    """Egyetlen író szál az egész folyamatra – a munkamenetek csak sorba állítanak."""
+    return ResponseWriter(get_store())
 
-CAPTIONS = {
-    "Prága": "Prága – 129 900 Ft/fő · 4 nap · Kulturális élmény",
-    "Barcelona": "Barcelona – 159 900 Ft/fő · 4 nap · Mediterrán élmény",
-    "Róma": "Róma – 134 900 Ft/fő · 4 nap · Történelmi élmény",
-}
 
-DECISION_FACTORS = [
-    "Az ajánlat ára",
-    "A város iránti kíváncsiságom",
-    "Korábbi pozitív élményeim a helyszínnel",
-    "Ismerőseim véleménye",
-    "Az ajánlat szövegének stílusa",
-    "A kép vizuális minősége",
-    "Az ajánlat platformja (ahol megjelent)",
-    "Az, hogy mesterséges intelligencia generálta-e",
-    "Távolság / utazás kényelme",
-    "Biztonsági szempontok",
-    "Időjárás / évszak",
-    "Saját pénzügyi helyzetem",
-    "Egyéb személyes szempont",
-]
-
-EXPERIENCE_ITEMS = [
-    "Mennyire érezte hitelesnek az ajánlatokat?",
-    "Mennyire volt könnyű megérteni a szövegeket/képeket?",
-    "Mennyire tűntek megbízhatónak az ajánlatok?",
-    "Mennyire volt kellemes az élmény?",
-    "Mennyire érezte személyre szabottnak az ajánlatokat?",
-    "Mennyire érezte, hogy a mesterséges intelligencia jól tudja, mi érdekli?",
-]
-
-AI_TRUST = [
-    "Általában bízom az MI által generált tartalmakban.",
-    "Az MI ajánlásai hasznosak számomra.",
-    "Az MI gyakran félrevezető információt ad. (fordított tétel)",
-    "Szívesen hozok döntést MI-ajánlások alapján.",
-]
-
-PERSUASION_KNOWLEDGE = [
-    "Könnyen felismerem, ha egy ajánlat marketing célból készült.",
-    "Gyorsan észreveszem, ha valami túl szép ahhoz, hogy igaz legyen.",
-    "Általában átlátok a reklámokon.",
-]
-
-MANIP_CHECK = [
-    "Az értékeléskor figyelmen kívül hagytam az árat.",
-    "Megértettem, hogy a tartalmakat MI generálta / állíthatta elő.",
-]
-
-DEMOGRAPHICS = {
-    "Nem": ["Nő", "Férfi", "Egyéb", "Nem szeretnék válaszolni"],
-    "Életkor": ["18-24", "25-34", "35-44", "45-54", "55+"],
-    "Legmagasabb iskolai végzettség": [
-        "Középiskola",
-        "Főiskola / Egyetem (BA/BSc)",
-        "Mesterképzés (MA/MSc)",
-        "PhD / DLA",
-    ],
-}
+def save_row(row: dict) -> bool:
+    """Append: egy sor beállítása az írási sorba (XLSX az export.py-val készül).
 
+    Ugyanaz a rid csak egyszer mentődik; az ismételt beküldés False-t ad.
+    """
+    with get_metrics().save_row.time():
+        return get_writer().submit(row)
 
 
-def nav(prev=None, next=None, submit=False, require_key=None):
-    def _get_val(rk):
-        # 1. top-level session_state
-        if rk in st.session_state:
-            return st.session_state[rk]
-        # 2. answers dict
-        if "answers" in st.session_state and rk in st.session_state["answers"]:
-            return st.session_state["answers"][rk]
+@st.cache_resource
+def get_notifier():
+    """Folyamatszintű e-mail értesítő a [email] titkok alapján (ha nincs beállítva: None)."""
+    try:
+        cfg = dict(st.secrets["email"])
+    except Exception:
         return None
-
-    c1, c2 = st.columns([1,1])
-
-    with c1:
-        if prev is not None and st.button("← Vissza", key=f"prev_{st.session_state.page}_to_{prev}"):
-            # ⬅️ oldal elhagyása
-            st.session_state.timestamps[f"page_{st.session_state.page}_left"] = datetime.utcnow().isoformat()
-            st.session_state.page = prev
-            st.session_state.timestamps[f"page_{st.session_state.page}_entered"] = datetime.utcnow().isoformat()
-            st.rerun()
-
-    with c2:
-        if submit:
-            if st.button("Beküldés ✅", key=f"submit_{st.session_state.page}"):
-                return "submit"
-        elif next is not None:
-            if st.button("Tovább →", key=f"next_{st.session_state.page}_to_{next}"):
-                if require_key:
-                    keys = require_key if isinstance(require_key, (list, tuple)) else [require_key]
-                    for rk in keys:
-                        val = _get_val(rk)
-                        if val is None:
-                            st.error("⚠️ Kérjük, töltsön ki minden mezőt, mielőtt továbblépne!")
-                            st.stop()
-                        if isinstance(val, dict) and any(v is None for v in val.values()):
-                            st.error("⚠️ Kérjük, töltsön ki minden mezőt, mielőtt továbblépne!")
-                            st.stop()
-
-                # ⬅️ oldal elhagyása
-                st.session_state.timestamps[f"page_{st.session_state.page}_left"] = datetime.utcnow().isoformat()
-                st.session_state.page = next
-                st.session_state.timestamps[f"page_{st.session_state.page}_entered"] = datetime.utcnow().isoformat()
-                st.rerun()
-    return None
-
-
-def calc_durations(timestamps: dict):
-    durations = {}
-    for key, value in timestamps.items():
-        if key.endswith("_entered"):
-            page_tag = key.replace("_entered", "")
-            entered = datetime.fromisoformat(value)
-            left_key = f"{page_tag}_left"
-            if left_key in timestamps:
-                left = datetime.fromisoformat(timestamps[left_key])
-                page_num = int(page_tag.split("_")[-1])
-                durations[page_num] = (left - entered).total_seconds()
-            else:
-                durations[int(page_tag.split("_")[-1])] = 0
-    return durations
-
-
-
-
-
-# oldal belépés ideje logolva
-if f"page_{page}_entered" not in st.session_state.timestamps:
-    st.session_state.timestamps[f"page_{page}_entered"] = datetime.utcnow().isoformat()
-
-
-
-# oldal belépés ideje logolva
-st.session_state.timestamps[f"page_{page}_entered"] = datetime.utcnow().isoformat()
-
-
-
-# 0. oldal – Bevezető + Beleegyezés + Instrukciók
-if page == 0:
-    st.title("🧭 MI-ajánlások a fogyasztói döntésekben")
-
-    st.markdown("""
-    Kedves Kitöltő!
-
-    Budai Katalin vagyok, a Budapesti Gazdaságtudományi Egyetem pénzügy-számvitel alapszakos hallgatója. 
-    Ez a kérdőív a Tudományos Diákköri Konferenciára készülő kutatásom része, amelyben azt vizsgálom, 
-    hogyan befolyásolhatja a mesterséges intelligencia a fogyasztói döntéshozatalt. 
-
-    A kitöltés körülbelül 8-10 percet vesz igénybe, és nagy segítséget jelent számomra. 
-    Még nagyobb támogatás, ha a kérdőívet másoknak is továbbítja, mert minél több válaszra van szükségem 
-    a kutatás sikeres megvalósításához.
-
-    Előre is köszönöm a segítségét és közreműködését!
-    """)
-
-    progress_bar(0, TOTAL_PAGES)
-
-    st.markdown('<div class="q-card">', unsafe_allow_html=True)
-    st.markdown("**Beleegyezés**")
-    consent = st.radio(
-        "Hozzájárulok a névtelen válaszaim kutatási célú felhasználásához.",
-        ["Igen", "Nem"], index=None, key="consent_0")
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    st.markdown('<div class="q-card">', unsafe_allow_html=True)
-  
-
-    if st.button("Kezdés →"):
-        if consent != "Igen":
-            st.error("A kérdőív folytatásához szükség van a hozzájárulásra.")
-        else:
-            st.session_state.timestamps[f"page_{st.session_state.page}_left"] = datetime.utcnow().isoformat()
-            st.session_state.page = 1
-            st.session_state.timestamps[f"page_{st.session_state.page}_entered"] = datetime.utcnow().isoformat()
-            st.rerun()
-
-
-# ===== Ajánlat oldalak (1-3) =====
-elif page == 1:
-    # belépési idő rögzítése
-    if f"page_{page}_entered" not in st.session_state.timestamps:
-        st.session_state.timestamps[f"page_{page}_entered"] = datetime.now()
-
-    st.markdown("**Instrukciók**")
-    st.write("A következő oldalakon MI által javasolt utazási ajánlatokat lát. "
-             "Kérjük, olvassa el / nézze meg, majd válaszoljon a kérdésekre.")
-    st.write("⚠️ A döntése során **ne vegye figyelembe az árat** – ezt külön is ellenőrizzük.")
-
-    if st.button("Tovább →"):
-        st.session_state.page = 2
-        st.rerun()
-
-elif page == 2:
-    progress_bar(page, TOTAL_PAGES)
-    st.caption(f"Oldal {page+1} / {TOTAL_PAGES}")
-    st.header("Ajánlat 1/3")
-    st.subheader("Prága – Kulturális élmény")
-
-    if st.session_state.group == "text":
-        st.markdown(TEXT_OFFERS["Prága"])
-    else:
-        st.image(IMAGES["Prága"], caption=CAPTIONS["Prága"])
-
-    nav(prev=1, next=3)
-
-
-elif page == 3:
-    progress_bar(page, TOTAL_PAGES)
-    st.caption(f"Oldal {page+1} / {TOTAL_PAGES}")
-    st.header("Ajánlat 2/3")
-    st.subheader("Barcelona – Mediterrán élmény")
-
-    if st.session_state.group == "text":
-        st.markdown(TEXT_OFFERS["Barcelona"])
-    else:
-        st.image(IMAGES["Barcelona"], caption=CAPTIONS["Barcelona"], use_container_width=True)
-
-    nav(prev=2, next=4)
-
-
-elif page == 4:
-    # belépési idő rögzítése
-    if f"page_{page}_entered" not in st.session_state.timestamps:
-        st.session_state.timestamps[f"page_{page}_entered"] = datetime.utcnow().isoformat()
-
-    progress_bar(page, TOTAL_PAGES)
-    st.caption(f"Oldal {page+1} / {TOTAL_PAGES}")
-    st.header("Ajánlat 3/3")
-    st.subheader("Róma – Történelmi élmény")
-
-    if st.session_state.group == "text":
-        st.markdown(TEXT_OFFERS["Róma"])
-    else:
-        st.image(IMAGES["Róma"], caption=CAPTIONS["Róma"], use_container_width=True)
-
-    nav(prev=3, next=5)
-
-
-# ===== 5. oldal: Döntés =====
-elif page == 5:
-    # belépési idő rögzítése
-    if f"page_{page}_entered" not in st.session_state.timestamps:
-        st.session_state.timestamps[f"page_{page}_entered"] = datetime.utcnow().isoformat()
-
-    progress_bar(page, TOTAL_PAGES)
-    st.caption(f"Oldal {page+1} / {TOTAL_PAGES}")
-    st.header("2. Döntés")
-
-    st.markdown('<div class="q-card">', unsafe_allow_html=True)
-    decision_choice = st.radio(
-        "Melyik ajánlatot fogadná el?",
-        ["Prága", "Barcelona", "Róma", "Egyiket sem"],
-        index=None,
-        key="decision_choice"
-    )
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    st.markdown('<div class="q-card">', unsafe_allow_html=True)
-    decision_count = st.radio(
-        "Összesen hány ajánlatot tartott elfogadhatónak?",
-        [0, 1, 2, 3],
-        index=None,
-        key="decision_count"
-    )
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    action = nav(prev=4, next=6, require_key=["decision_choice", "decision_count"])
-
-    
-    if action:
-        errs = []
-        if decision_choice is None:
-            errs.append("Válassza ki, melyik ajánlatot fogadná el.")
-        if decision_count is None:
-            errs.append("Adja meg, hány ajánlatot tartott elfogadhatónak.")
-        if decision_choice not in (None, "Egyiket sem") and decision_count == 0:
-            errs.append("A választott ajánlatnak szerepelnie kell az elfogadhatók között.")
-        if decision_choice == "Egyiket sem" and decision_count != 0:
-            errs.append("Ha „Egyiket sem”-et választ, az elfogadhatók száma 0 kell legyen.")
-
-        if len(errs) > 0:
-            st.error(" • ".join(errs))
-        else:
-            st.session_state.answers["decision_choice"] = decision_choice
-            st.session_state.answers["decision_count"] = decision_count
-            st.session_state.page += 1
-            st.rerun()
-
-# ===== 6. oldal: Befolyásoló tényezők =====
-elif page == 6:
-    # belépési idő rögzítése
-    if f"page_{page}_entered" not in st.session_state.timestamps:
-        st.session_state.timestamps[f"page_{page}_entered"] = datetime.utcnow().isoformat()
-
-    progress_bar(page, TOTAL_PAGES)
-    st.caption(f"Oldal {page+1} / {TOTAL_PAGES}")
-    st.header("Mi befolyásolta a döntését?")
-    st.write("Az alábbi kérdések arra vonatkoznak, hogyan élte meg a döntés meghozatalát, "
-             "és hogyan viszonyul az utólagos következményekhez. "
-             "Kérjük, értékelje az állításokat az adott skálán!")
-
-    st.caption("Kérjük, értékelje az alábbi állításokat egy 1-től 10-ig terjedő skálán, "
-               "ahol az 1 = egyáltalán nem értek egyet, a 10 = teljes mértékben egyetértek.")
-
-    factors_ans = {}
-    for i, q in enumerate(DECISION_FACTORS):
-     factors_ans[q] = st.slider(
-        q,
-        min_value=1,
-        max_value=10,
-        value=5,   # alapérték, mindig van (itt nincs None lehetőség)
-        step=1,
-        key=f"factor_{i}"
-        
-        )
-
-    st.session_state.answers["factors"] = factors_ans
-      
-    nav(prev=5, next=7, require_key="factors")
-
-
-# ===== 7. oldal: Döntési élmény =====
-elif page == 7:
-    # belépési idő rögzítése
-    if f"page_{page}_entered" not in st.session_state.timestamps:
-        st.session_state.timestamps[f"page_{page}_entered"] = datetime.utcnow().isoformat()
-
-    progress_bar(page, TOTAL_PAGES)
-    st.caption(f"Oldal {page+1} / {TOTAL_PAGES}")
-    st.header("Döntési élmény")
-    st.caption("Kérjük, értékelje az alábbi állításokat egy 1-től 10-ig terjedő skálán, "
-               "ahol az 1 = egyáltalán nem értek egyet, a 10 = teljes mértékben egyetértek.")
-
-    experience_qs = [
-        "Biztos voltam abban, hogy jó döntést hoztam.",
-        "Megkönnyebbülést éreztem a választás után.",
-        "Nyugodtnak éreztem magam a döntés közben.",
-        "Úgy éreztem, hogy a döntés az én kezemben van."
-    ]
-
-    exp_ans = {}
-    for i, q in enumerate(experience_qs):
-        exp_ans[q] = st.radio(
-            q,
-            list(range(1, 11)),
-            horizontal=True,
-            key=f"exp_{i}",
-            index=None
-        )
-    st.session_state.answers["exp_ans.items"] = exp_ans
-
-   # --- ÉRVÉNYESSÉG ELLENŐRZÉS + NAV ---
-    all_valid = True
-    for q, val in exp_ans.items():
-        if val is None:
-            all_valid = False
-
-    nav(prev=6, next=8, require_key="experience")
-
-
-
-# 8. oldal – 4.1 Élménykérdések
-elif page == 8:
-    # belépési idő rögzítése
-    if f"page_{page}_entered" not in st.session_state.timestamps:
-        st.session_state.timestamps[f"page_{page}_entered"] = datetime.utcnow().isoformat()
-
-    progress_bar(page, TOTAL_PAGES)
-    st.caption(f"Oldal {page+1} / {TOTAL_PAGES}")
-    st.header("Élményre vonatkozó kérdések")
-    st.write("Az alábbi kérdések arra vonatkoznak, milyen élmény volt a döntési folyamat számára. ")
-    st.caption("Kérjük, értékelje az alábbi állításokat egy 1-től 10-ig terjedő skálán, ahol az 1 = egyáltalán nem értek egyet, a 10 = teljes mértékben egyetértek.")
-
-    # ⬅️ EZ HIÁNYZOTT
-    confirmation_qs = [
-        "A döntés után is gondolkodtam, vajon helyesen választottam-e.",
-        "Szerettem volna, ha valaki megerősíti, hogy jól döntöttem.",
-        "Úgy éreztem, szívesen megosztanám másokkal a választásomat.",
-    ]
-
-    confirmation_ans = {}
-    for i, q in enumerate(confirmation_qs):
-        confirmation_ans[q] = st.radio(
-            q,
-            list(range(1, 11)),
-            horizontal=True,
-            index=None,
-            key=f"conf7_{i}"   # ← egyedi kulcs (ne ütközzön a 8. oldallal!)
-        )
-
-    st.session_state.answers["confirmation"] = confirmation_ans
-
-    # --- ÉRVÉNYESSÉG ELLENŐRZÉS + NAV ---
-    all_valid = True
-    for q, val in confirmation_ans.items():
-        if val is None:
-            all_valid = False
-
-    nav(prev=7, next=9, require_key="confirmation")
-
-
-
-
-
-
-elif page == 9:
-    # belépési idő rögzítése
-    if f"page_{page}_entered" not in st.session_state.timestamps:
-        st.session_state.timestamps[f"page_{page}_entered"] = datetime.utcnow().isoformat()
-
-    progress_bar(page, TOTAL_PAGES)
-    st.caption(f"Oldal {page+1} / {TOTAL_PAGES}")
-    st.header("Megerősítéskeresés")
-    st.write("Az alábbi kérdések arra vonatkoznak, mennyire igényel megerősítést a döntései után. ")
-    st.caption("Kérjük, értékelje az alábbi állításokat egy 1-től 10-ig terjedő skálán, ahol az 1 = egyáltalán nem értek egyet, a 10 = teljes mértékben egyetértek.")
-
-    confirmation_qs = [
-        "Vásárlás után kérem mások véleményét, hogy jól döntöttem-e.",
-        "Fontos számomra, hogy a környezetem jóváhagyja a vásárlási döntéseimet.",
-        "Bizonytalan helyzetben inkább megvárom, mit mondanak mások a termékről.",
-        "Gyakran hasonlítom össze a választásomat az ismerőseim döntéseivel.",
-    ]
-
-    confirmation_ans = {}
-    for i, q in enumerate(confirmation_qs):
-        confirmation_ans[q] = st.radio(
-            q,
-            list(range(1, 11)),
-            horizontal=True,
-            index=None,
-            key=f"conf8_{i}"   # ← egyedi kulcs (ne ütközzön a 7. oldallal!)
-        )
-
-    st.session_state.answers["confirmation_page8"] = confirmation_ans
-
-   # --- ÉRVÉNYESSÉG ELLENŐRZÉS + NAV ---
-    all_valid = True
-    for q, val in confirmation_ans.items():
-        if val is None:
-            all_valid = False
-
-    nav(prev=8, next=10, require_key="confirmation_page8")
-
-
-
-
-# 9. oldal – 4.2 Felelősségérzet
-elif page == 10:
-    # belépési idő rögzítése
-    if f"page_{page}_entered" not in st.session_state.timestamps:
-        st.session_state.timestamps[f"page_{page}_entered"] = datetime.utcnow().isoformat()
-
-    progress_bar(page, TOTAL_PAGES)
-    st.caption(f"Oldal {page+1} / {TOTAL_PAGES}")
-    st.header("Felelősségérzet")
-    st.write("Az alábbi kérdések arra vonatkoznak, mennyire érzi magát felelősének a döntései után. ")
-    st.caption("Kérjük, értékelje az alábbi állításokat egy 1-től 10-ig terjedő skálán, ahol az 1 = egyáltalán nem értek egyet, a 10 = teljes mértékben egyetértek.")
-
-    confirmation_qs = [
-        "Ha egy termék nem válik be, magamat hibáztatom a rossz döntésért.",
-        "Vásárláskor gyakran inkább mások vagy egy rendszer javaslataira támaszkodom, nem a saját megérzésemre. (fordított tétel)",
-        "Az elégedettségem vagy csalódásom a vásárlásaimnál az én döntésem következménye.",
-        
-    ]
-
-    confirmation_ans = {}
-    for i, q in enumerate(confirmation_qs):
-        confirmation_ans[q] = st.radio(q, list(range(1,11)), horizontal=True, key=f"conf_{i}", index=None)
-    st.session_state.answers["confirmation"] = confirmation_ans
-
-# --- ÉRVÉNYESSÉG ELLENŐRZÉS ---
-    all_valid = True
-
-# minden rádió ki van töltve?
-    for q, val in st.session_state.get("confirmation", {}).items():
-     if val is None:
-        all_valid = False
-
-    nav(prev=9, next=11, require_key="confirmation")
-
-    
-
-# 10. oldal – 4.3 Hogyan hatott Önre az MI-ajánlás?
-if page == 11:
-    # belépési idő rögzítése
-    if f"page_{page}_entered" not in st.session_state.timestamps:
-        st.session_state.timestamps[f"page_{page}_entered"] = datetime.utcnow().isoformat()
-
-    progress_bar(page, TOTAL_PAGES)
-    st.caption(f"Oldal {page+1} / {TOTAL_PAGES}")
-    st.header("Hogyan hatott Önre az MI-ajánlás a döntése során?")
-
-    ai_influence = st.radio(
-        "Kérjük, válassza ki az Önre leginkább jellemző állítást:",
-        [
-            "Egyáltalán nem vettem figyelembe az ajánlást",
-            "Az ajánlás egybeesett azzal, amit magamtól is választottam volna",
-            "Az ajánlás új szempontot adott, amit figyelembe vettem",
-            "Az ajánlás teljesen megváltoztatta a döntésemet"
-        ],
-        index=None,
-        key="ai_influence"
+    return EmailNotifier(
+        sender=cfg["address"],
+        password=cfg.get("password"),
+        receiver=cfg.get("receiver", cfg["address"]),
+        host=cfg.get("host", "smtp.gmail.com"),
+        port=int(cfg.get("port", 587)),
+        starttls=bool(cfg.get("starttls", True)),
+        # pl. digest_minutes = 10  →  "N új kitöltés az elmúlt 10 percben"
+        digest_seconds=float(cfg.get("digest_minutes", 0)) * 60,
     )
 
-    st.session_state.answers["ai_influence"] = ai_influence
-
-# --- ÉRVÉNYESSÉG ELLENŐRZÉS ---
-    all_valid = True
-
-    if st.session_state.get("ai_influence") is None:  # nincs választás
-      all_valid = False
 
-    nav(prev=10, next=12, require_key="ai_influence")
-
-
-
-
-
-# 11. Manipuláció-ellenőrzés + figyelmi próba
-elif page == 12:
-    # belépési idő rögzítése
-    if f"page_{page}_entered" not in st.session_state.timestamps:
-        st.session_state.timestamps[f"page_{page}_entered"] = datetime.utcnow().isoformat()
-
-    progress_bar(page, TOTAL_PAGES)
-    st.caption(f"Oldal {page+1} / {TOTAL_PAGES}")
-    st.header("Ellenőrző kérdések")
-    st.caption("Az alábbi kérdések arra szolgálnak, hogy ellenőrizzük a figyelmet és a válaszok következetességét.")
-
-
-    st.markdown('<div class="q-card">', unsafe_allow_html=True)
-    st.subheader("Manipuláció-ellenőrzés")
-    mc = {}
-    for i, q in enumerate(MANIP_CHECK):
-        mc[q] = st.radio(q, list(range(1,11)), horizontal=True, key=f"mc_{i}")
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    st.markdown('<div class="q-card">', unsafe_allow_html=True)
-    st.subheader("Figyelmi próba")
-    attn = st.radio("Válassza a **harmadik** opciót!", ["Első", "Második", "Harmadik", "Negyedik"],
-                    index=None, key="attention_check")
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    st.session_state.answers["manip_check"] = mc
-    st.session_state.answers["attention"] = attn
-
-# --- ÉRVÉNYESSÉG ELLENŐRZÉS ---
-    all_valid = True
-
-    if st.session_state.get("attention") is None:
-        all_valid = False
-
-    nav(prev=11, next=13, require_key="attention")
-
-
-
-
-
-# 12. oldal – 4.4 Alternatívák mérlegelése
-elif page == 13:
-    # belépési idő rögzítése
-    if f"page_{page}_entered" not in st.session_state.timestamps:
-        st.session_state.timestamps[f"page_{page}_entered"] = datetime.utcnow().isoformat()
+def send_email_notification(record: dict):
+    """Értesítés sorba állítása; a küldés háttérszálon fut, hiba esetén sem akasztja meg a mentést."""
+    notifier = get_notifier()
+    if notifier is not None:
+        notifier.notify(record)
 
-    progress_bar(page, TOTAL_PAGES)
-    st.caption(f"Oldal {page+1} / {TOTAL_PAGES}")
-    st.header("Alternatívák mérlegelése")
-    st.write("Az alábbi kérdések arra vonatkoznak, mennyire mérlegeli a különböző lehetőségeket döntés előtt.")
-    st.caption("Kérjük, értékelje az alábbi állításokat egy 1-től 10-ig terjedő skálán, ahol az 1 = egyáltalán nem értek egyet, a 10 = teljes mértékben egyetértek.")
 
-    maximization_qs = [
-        "Vásárlás előtt több különböző terméket is össze szoktam hasonlítani.",
-        "Fontos számomra, hogy minden lehetséges alternatívát megvizsgáljak.",
-        "Sok időt töltök azzal, hogy más opciókat is mérlegeljek.",
-        "Gyakran átnézek több weboldalt vagy boltot, mielőtt döntök.",
-        "Általában nem elégszem meg az első javasolt lehetőséggel. (fordított tétel)"
-    ]
+@st.cache_resource
+def get_metrics():
+    """Folyamatszintű mérőszámok; kiírás a [metrics] titkok szerint.
 
-    maximization_ans = {}
-    for i, q in enumerate(maximization_qs):
-        maximization_ans[q] = st.radio(q, list(range(1,11)), horizontal=True, key=f"max_{i}", index=None)
-    st.session_state.answers["maximization"] = maximization_ans
+    file (alap: metrics.prom) és interval (mp) – időszakosan, atomikusan írt szövegfájl,
+    folyamatonként külön (metrics.<pid>.prom, process címkével; a textfile gyűjtő mindet olvassa);
+    port – opcionális HTTP végpont a localhoston (GET /metrics), csak az első folyamaté.
+    """
+    try:
+        cfg = dict(st.secrets["metrics"])
+    except Exception:
+        cfg = {}
+    metrics = SurveyMetrics()
+    metrics.watch_writer(get_writer())
+    metrics.watch_admission(get_admission())
+    metrics.watch_assets(get_asset_cache())
+    notifier = get_notifier()
+    if notifier is not None:
+        metrics.watch_notifier(notifier)
+    metrics.registry.start_file_writer(process_path(cfg.get("file", METRICS_PATH)),
+                                       float(cfg.get("interval", 15)))
+    if cfg.get("port"):
+        try:
+            metrics.registry.start_http(int(cfg["port"]))
+        except OSError:
+            # több app-folyamat esetén csak az első kapja meg a portot (és az csak a saját
+            # mérőszámait adja); a többi folyamat adatai a saját metrics.<pid>.prom fájljukban
+            log.warning("A mérőszám-végpont portja foglalt: %s", cfg["port"])
+    return metrics
+
+
+def finish_run(page):
+    """A szkriptfutás vége (az oldal megjelenítése vagy oldalváltás): mérés + profil lezárása."""
+    get_metrics().rerun.observe(time.perf_counter() - RUN_STARTED, page=page)
+    if run_profile is not None:
+        run_profile.stop(page)
+
+
+@st.cache_resource
+def get_profiling_config():
+    """[profiling] pages = [2, 3, 4, 18], rate = 0.1 → ezen oldalak futásainak 10%-a; alapból ki.
+
+    key = "..." → egy munkamenet a ?profile=<key> paraméterrel kérhet profilt. Külön titok, nem
+    az admin jelszó: a kérdőív URL-je naplókba, előzményekbe kerülhet.
+    """
+    try:
+        cfg = dict(st.secrets["profiling"])
+    except Exception:
+        cfg = {}
+    return {"pages": set(cfg.get("pages", ())), "rate": float(cfg.get("rate", 0)),
+            "key": str(cfg.get("key", ""))}
+
+
+def start_profile(page):
+    """Profil indítása, ha a munkamenet kérte (?profile=<[profiling] key>) vagy a beállítás kijelöli."""
+    ss = st.session_state
+    cfg = get_profiling_config()
+    if "profiling" not in ss:
+        value = st.query_params.get("profile")
+        ss.profiling = bool(cfg["key"] and value) and hmac.compare_digest(str(value), cfg["key"])
+        if value is not None:
+            del st.query_params["profile"]  # a kulcs ne maradjon a címsorban
+    sampled = page in cfg["pages"] and cfg["rate"] > 0 and random.random() < cfg["rate"]
+    if not (ss.profiling or sampled):
+        return None
+    return RerunProfiler.start(page, ss.group, ss.rid)
 
-# --- ÉRVÉNYESSÉG ELLENŐRZÉS ---
-    all_valid = True
 
+@st.cache_resource
+def get_admission():
+    """Befogadás-szabályozó az [admission] titkok alapján (max_active = 0: nincs korlát).
 
-    for q, val in st.session_state.get("maximization", {}).items() : 
-     if val is None:
-           all_valid = False
+    max_active – egyidejűleg aktív kitöltések, idle_minutes – ennyi tétlenség után már nem
+    számít aktívnak, retry_seconds – a várakozó oldal újrapróbálkozási ideje.
+    """
+    try:
+        cfg = dict(st.secrets["admission"])
+    except Exception:
+        cfg = {}
+    return AdmissionController(max_active=int(cfg.get("max_active", 0)),
+                               idle_s=float(cfg.get("idle_minutes", 5)) * 60,
+                               retry_s=float(cfg.get("retry_seconds", 15)))
 
-    nav(prev=12, next=14, require_key="maximization")
 
-   
+def render_waiting(position, retry_s):
+    """Könnyű várakozó oldal: nincs kép, nincs kérdőív; visszaszámlálás, majd automatikus újrapróbálkozás."""
+    from streamlit.components.v1 import html
+    from streamlit_autorefresh import st_autorefresh
 
+    st.title("🧭 MI-ajánlások a fogyasztói döntésekben")
+    st.info("Jelenleg sokan töltik ki a kérdőívet, ezért egy kis türelmet kérünk. "
+            "Az oldal magától továbblép, amint sorra kerül – kérjük, ne zárja be.")
+    st.caption(f"Helye a sorban: {position}.")
+    secs = int(retry_s)
+    html(f"""<div style="font-family:sans-serif;color:#555">Újrapróbálkozás
+         <b id="c">{secs}</b> másodperc múlva…</div>
+         <script>let s={secs};const c=document.getElementById("c");
+         setInterval(()=>{{if(s>0){{s-=1;c.textContent=s;}}}},1000);</script>""", height=40)
+    st_autorefresh(interval=secs * 1000, key="admission_retry")
 
-# 13. oldal – 4.5 Nyitott kérdés
-elif page == 14:
-    # belépési idő rögzítése
-    if f"page_{page}_entered" not in st.session_state.timestamps:
-        st.session_state.timestamps[f"page_{page}_entered"] = datetime.utcnow().isoformat()
 
-    progress_bar(page, TOTAL_PAGES)
-    st.caption(f"Oldal {page+1} / {TOTAL_PAGES}")
-    st.header("Nyitott kérdés")
-    st.write("Kérem, írja le röviden, mi volt az a legfontosabb szempont, ami alapján végül az adott ajánlatot választotta.")
+def progress_bar(current_page, total_pages):
+    st.progress(current_page / total_pages)
 
-    # 🔹 ez a mező mindig megjelenik
-    choice_reason = st.text_area("Válasza:", key="choice_reason")
 
-    # 🔹 mentés az answers-be
-    st.session_state.answers["choice_reason"] = choice_reason
+@st.cache_resource
+def get_checkpoints():
+    """Félbehagyott kitöltések folytatási pontjai (egy hétnél régebbiek induláskor törlődnek)."""
+    store = CheckpointStore()
+    store.purge(7 * 24 * 3600)
+    return store
 
-    
-    
-  # --- ÉRVÉNYESSÉG ELLENŐRZÉS ---
-    all_valid = True
 
-    if st.session_state.get("choice_reason") is None:
-        all_valid = False
+def save_checkpoint():
+    """A munkamenet tömör állapotának mentése a folytatási tokenhez."""
+    ss = st.session_state
+    get_checkpoints().save(ss.token, ss.rid, ss.group, ss.page, ss.entered_at,
+                           ss.answers, ss.timer, ss.get("submitted", False), owner=session_id())
 
-    nav(prev=13, next=15, require_key="choice_reason")
 
+@st.cache_resource
+def get_token_owners():
+    """Folytatási token -> az azt használó munkamenet (megosztott linkek kiszűrése).
 
-# 14. oldal – 5. Vásárlási gyakoriság
-elif page == 15:
-    # belépési idő rögzítése
-    if f"page_{page}_entered" not in st.session_state.timestamps:
-        st.session_state.timestamps[f"page_{page}_entered"] = datetime.utcnow().isoformat()
+    A tulajdonos a közös checkpoints.sqlite3 sorában van: több app-folyamatnál is csak egy
+    munkamenet folytathat egy tokent (ehhez a folyamatok ugyanabból a mappából fussanak).
+    """
+    from streamlit import runtime
 
-    progress_bar(page, TOTAL_PAGES)
-    st.caption(f"Oldal {page+1} / {TOTAL_PAGES}")
-    st.header("Vásárlási gyakoriság")
-    st.caption("Kérem, jelölje, milyen gyakran vásárol az alábbi módokon.")
+    return TokenOwners(get_checkpoints(),
+                       is_alive=lambda sid: runtime.get_instance().is_active_session(sid))
 
-    freq_opts = ["Soha", "Ritkán (évente 1–2 alkalom)", "Havonta", "Hetente", "Hetente többször"]
 
-    freq = {}
-    freq["Milyen gyakran vásárol online (pl. webshopban, alkalmazáson keresztül)?"] = st.radio(
-        "Milyen gyakran vásárol online (pl. webshopban, alkalmazáson keresztül)?",
-        freq_opts, index=None, key="freq_online"
-    )
-    freq["Milyen gyakran vásárol személyesen (pl. boltban, üzletben)?"] = st.radio(
-        "Milyen gyakran vásárol személyesen (pl. boltban, üzletben)?",
-        freq_opts, index=None, key="freq_offline"
-    )
-    freq["Milyen gyakran használ mesterséges intelligencia eszközt (pl. chatbotot, ajánlórendszert) vásárlásai során?"] = st.radio(
-        "Milyen gyakran használ mesterséges intelligencia eszközt (pl. chatbotot, ajánlórendszert) vásárlásai során?",
-        freq_opts, index=None, key="freq_ai"
-    )
+def session_id():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
 
-    st.session_state.answers["frequency"] = freq
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        return ctx.session_id
+    return st.session_state.setdefault("session_id", uuid.uuid4().hex)
 
-# --- ÉRVÉNYESSÉG ELLENŐRZÉS ---
-    all_valid = True
 
-    for q, val in st.session_state.get("frequency", {}).items():
-    
-        all_valid = False
+@st.cache_resource
+def get_events():
+    """Folyamatszintű, pufferelt navigációs eseménynapló (events.jsonl, lásd events.py)."""
+    return EventLog()
 
-    nav(prev=14, next=16, require_key="frequency")
 
-   
+def log_event(type_, page, **extra):
+    get_events().log(type_, page, st.session_state.rid, st.session_state.group, **extra)
 
 
-# 15. oldal – AIAS-4 skála
-elif page == 16:
-    # belépési idő rögzítése
-    if f"page_{page}_entered" not in st.session_state.timestamps:
-        st.session_state.timestamps[f"page_{page}_entered"] = datetime.utcnow().isoformat()
+# ---------- AJÁNLATOK (képek, szövegek) ----------
+@st.cache_resource
+def get_image_variants():
+    """A képek kisebb WebP/JPEG változatai (lásd images.py); a bemelegítő szál tölti fel,
+    addig üres, és az eredeti PNG jelenik meg."""
+    return {}
 
-    progress_bar(page, TOTAL_PAGES)
-    st.caption(f"Oldal {page+1} / {TOTAL_PAGES}")
-    st.header("AIAS-4 skála")
-    st.write("Az alábbi kérdések azt vizsgálják, hogyan látja a mesterséges intelligencia jövőbeli hatásait.")
-    st.caption("Kérjük, értékelje az alábbi állításokat egy 1-től 10-ig terjedő skálán, ahol az 1 = egyáltalán nem értek egyet, a 10 = teljes mértékben egyetértek")
-    aias_qs = [
-        "Úgy gondolom, hogy a mesterséges intelligencia javítani fogja az életemet.",
-        "Úgy gondolom, hogy a mesterséges intelligencia javítani fogja a munkámat.",
-        "Úgy gondolom, hogy a jövőben használni fogok mesterséges intelligencia alapú technológiát.",
-        "Úgy gondolom, hogy a mesterséges intelligencia összességében pozitív az emberiség számára."
-    ]
 
-    aias_ans = {}
-    for i, q in enumerate(aias_qs):
-        aias_ans[q] = st.radio(q, list(range(1,11)), horizontal=True, key=f"aias_{i}", index=None)
+@st.cache_resource
+def get_asset_cache():
+    """Közös képi/szöveges gyorsítótár; a keret a [assets] max_mb titokkal állítható (alap: 64 MB)."""
+    try:
+        max_mb = float(st.secrets["assets"]["max_mb"])
+    except Exception:
+        max_mb = 64
+    return AssetCache(int(max_mb * 1024 * 1024))
 
-    st.session_state.answers["aias"] = aias_ans
 
-# --- ÉRVÉNYESSÉG ELLENŐRZÉS ---
-    all_valid = True
+def offer_text(name):
+    return get_asset_cache().get(("text", name), lambda: TEXT_OFFERS[name])
 
-    for q, val in st.session_state.get("aias", {}).items():
-     
-        all_valid = False
 
-    nav(prev=15, next=17, require_key="aias")
+def show_offer_text(name):
+    st.markdown(offer_text(name))
 
-  
 
+def offer_image(name):
+    """Ajánlatkép a gyorsítótárból: ("html", <picture> elem) vagy ("bytes", képfájl tartalma)."""
+    cache = get_asset_cache()
+    variants = get_image_variants().get(name)
+    if variants and st.get_option("server.enableStaticServing"):
+        return "html", cache.get(("picture", name), lambda: picture_html(variants, CAPTIONS[name]))
+    # statikus kiszolgálás nélkül a kész bájtokat adjuk át (nincs újraolvasás / újrakódolás)
+    path = fallback_file(variants) if variants else BASE_DIR / IMAGES[name]
+    return "bytes", cache.get(("image", name, path.name), path.read_bytes)
 
-# 16. oldal – Mesterséges intelligencia használata
-elif page == 17:
-    # belépési idő rögzítése
-    if f"page_{page}_entered" not in st.session_state.timestamps:
-        st.session_state.timestamps[f"page_{page}_entered"] = datetime.utcnow().isoformat()
 
-    progress_bar(page, TOTAL_PAGES)
-    st.caption(f"Oldal {page+1} / {TOTAL_PAGES}")
-    st.header("Mesterséges intelligencia használata")
+def show_offer_image(name, **kwargs):
+    """Ajánlatkép: a kijelzőhöz illő legkisebb változat, tartalékként az eredeti PNG."""
+    kind, payload = offer_image(name)
+    if kind == "html":
+        st.markdown(payload, unsafe_allow_html=True)
+    else:
+        st.image(payload, caption=CAPTIONS[name], **kwargs)
 
-    ai_use = st.radio(
-        "Használja Ön a mindennapokban mesterséges intelligencia alapú eszközöket (pl. ChatGPT, ajánlórendszerek, chatbotok)?",
-        ["Igen", "Nem"],
-        index=None,
-        key="ai_use"
-    )
 
-    ai_freq = st.radio(
-        "Milyen gyakran használ mesterséges intelligenciát?",
-        ["Soha", "Ritkán", "Havonta", "Hetente", "Hetente többször"],
-        index=None,
-        key="ai_freq"
-    )
+@st.cache_resource
+def get_assigner():
+    """Kiegyensúlyozott csoportbesorolás; blokkméret és kvóták az [assignment] titkokból."""
+    try:
+        cfg = dict(st.secrets["assignment"])
+    except Exception:
+        cfg = {}
+    quotas = {k: int(v) for k, v in dict(cfg.get("quotas", {})).items()}
+    return GroupAssigner(block_size=int(cfg.get("block_size", 4)), quotas=quotas)
+
+
+# ---------- BEMELEGÍTÉS (háttérszálon; az első kitöltő oldala nem vár rá) ----------
+# a képváltozatok előre is elkészíthetők indítás előtt:  python images.py
+def warm_up(stats):
+    """Tárak, háttérszálak, képváltozatok és ajánlatok előtöltése; lépésenkénti idővel."""
+    steps = stats["steps"]
+
+    def step(name, fn):
+        t = time.perf_counter()
+        try:
+            fn()
+        except Exception:
+            log.warning("Bemelegítés: %s sikertelen", name, exc_info=True)
+        steps[name] = round(time.perf_counter() - t, 3)
+
+    step("store", get_writer)
+    step("metrics", get_metrics)
+    step("checkpoints", get_checkpoints)
+    step("events", get_events)
+    step("assignment", get_assigner)
+    step("images", lambda: get_image_variants().update(build_all(IMAGES)))
+    for name in TEXT_OFFERS:
+        step(f"offer:{name}", lambda: (offer_text(name), offer_image(name)))
+    stats["warmup_s"] = round(sum(steps.values()), 3)
+    log.info("Bemelegítés kész: %.3f s %s", stats["warmup_s"], steps)
+
+
+@st.cache_resource
+def get_startup():
+    """A bemelegítés indítása folyamatonként egyszer; az állapota (warmup_s = None: még fut)."""
+    stats = {"steps": {}, "warmup_s": None, "first_render_s": None}
+    threading.Thread(target=warm_up, args=(stats,), name="warm-up", daemon=True).start()
+    return stats
+
+
+def mark_first_render():
+    """Az első teljes kérdőívoldal ideje a folyamatban (a futás elejétől, importokkal együtt)."""
+    stats = get_startup()
+    if stats["first_render_s"] is None:
+        stats["first_render_s"] = round(time.perf_counter() - RUN_STARTED, 3)
+        log.info("Első megjelenítés: %.3f s", stats["first_render_s"])
+
+
+get_startup()
+
+
+# ---------- ADMIN NÉZET (?admin=1, jelszóval) ----------
+@st.cache_resource
+def get_aggregator():
+    """Az admin nézet összesítője; minden frissítés csak az új sorokat olvassa be."""
+    return ResultsAggregator()
+
+
+if "admin" in st.query_params:
+    render_admin(get_store(), get_aggregator(), startup=get_startup(),
+                 admission=get_admission().stats(), assets=get_asset_cache().stats())
+    st.stop()
 
-    st.session_state.answers["ai_use"] = ai_use
-    st.session_state.answers["ai_freq"] = ai_freq
 
-# --- ÉRVÉNYESSÉG ELLENŐRZÉS ---
-    all_valid = True
+# ---------- FOLYTATÁS (?t=token → a megszakadt kitöltés visszatöltése) ----------
+if "token" not in st.session_state:
+    token = st.query_params.get("t")
+    resumed = get_checkpoints().load(token) if token else None
+    # beküldött kitöltés linkje, vagy a token egy másik, még nyitott munkamenethez tartozik
+    # (továbbküldött link): a látogató új tokennel, új kitöltést kezd
+    if resumed is not None and (resumed["submitted"]
+                                or not get_token_owners().claim(token, session_id())):
+        resumed = None
+    if resumed is not None:
+        for k, v in resumed.items():
+            st.session_state[k] = v
+    else:
+        token = new_token()
+        get_token_owners().own(token, session_id())
+        st.query_params["t"] = token
+    st.session_state.token = token
+
+# ---------- BEFOGADÁS (túlterheléskor az új érkezők várnak, a megkezdettek folytatják) ----------
+if "group" in st.session_state:
+    if not st.session_state.get("submitted"):
+        get_admission().touch(st.session_state.token)
+else:
+    admitted, position, retry_s = get_admission().try_admit(st.session_state.token)
+    if not admitted:
+        render_waiting(position, retry_s)
+        st.stop()
 
-    if st.session_state.get("ai_use") is None:
-       all_valid = False
-       if st.session_state.get("ai_freq") is None:
-        all_valid = False
+# ---------- SESSION ----------
+if "rid" not in st.session_state:
+    st.session_state.rid = str(uuid.uuid4())
+if "page" not in st.session_state:
+    st.session_state.page = 0
+if "entered_at" not in st.session_state:
+    st.session_state.entered_at = datetime.utcnow().isoformat()
+new_group = "group" not in st.session_state
+if new_group:
+    group = get_assigner().assign()
+    if group is None:
+        st.info("Köszönjük az érdeklődést! A kérdőív kitöltői létszáma betelt, új kitöltést már nem fogadunk.")
+        st.stop()
+    st.session_state.group = group
+if "answers" not in st.session_state:
+    st.session_state.answers = AnswerSheet()
+if "timer" not in st.session_state:
+    st.session_state.timer = PageTimer(TOTAL_PAGES + 1)
+if new_group:
+    # már a 0. oldal újratöltése is ugyanazt a csoportot kapja vissza (?t=), nem újat
+    save_checkpoint()
+page = st.session_state.page
 
-    nav(prev=16, next=18, require_key="ai_use")
+# minden futás: rerun számlálása (új munkamenetnél / folytatásnál belépés is)
+if st.session_state.timer.current != page:
+    log_event("enter", page)
+st.session_state.timer.rerun(page)
+if not st.session_state.get("submitted"):
+    get_metrics().live.touch(st.session_state.rid)
+run_profile = start_profile(page)
+
+
+# ---------- NAVIGÁCIÓ ----------
+def go_to(target):
+    """Oldalváltás: az elhagyott oldal lezárása, az új oldal látogatásának indítása."""
+    current = st.session_state.page
+    log_event("back" if target < current else "leave", current, to=target)
+    log_event("enter", target)
+    st.session_state.timer.switch(target)
+    st.session_state.page = target
+    save_checkpoint()
+    finish_run(current)
+    st.rerun()
+
+
+def check_page(spec, values: dict) -> bool:
+    """Kötelező mezők + az oldal saját ellenőrzése; hiba esetén üzenet és False."""
+    if any(values.get(it.key) is None for it in spec.items if it.required):
+        st.error("⚠️ Kérjük, töltsön ki minden mezőt, mielőtt továbblépne!")
+        log_event("invalid", spec.number, reason="missing")
+        get_metrics().nav_rejections.inc(page=spec.number, reason="missing")
+        return False
+    errs = spec.validate(values) if spec.validate else []
+    if len(errs) > 0:
+        st.error(" • ".join(errs))
+        log_event("invalid", spec.number, reason="rule")
+        get_metrics().nav_rejections.inc(page=spec.number, reason="rule")
+        return False
+    return True
+
+
+def nav(spec, values=None):
+    c1, c2 = st.columns([1,1])
 
-    
+    with c1:
+        if spec.prev is not None and st.button("← Vissza", key=f"prev_{spec.number}_to_{spec.prev}"):
+            go_to(spec.prev)
 
+    with c2:
+        if spec.next is not None and st.button("Tovább →", key=f"next_{spec.number}_to_{spec.next}"):
+            if check_page(spec, values or {}):
+                go_to(spec.next)
 
 
+def form_nav(spec, next_label="Tovább →"):
+    """Űrlapon belüli Vissza / Tovább: a kattintásig a válaszok a böngészőben maradnak,
+    az oldal összes válasza egyetlen rerunban érkezik meg. Visszaadja: (vissza, tovább)."""
+    c1, c2 = st.columns([1,1])
+    back = spec.prev is not None and c1.form_submit_button("← Vissza")
+    forward = c2.form_submit_button(next_label)
+    return back, forward
+
+
+def submit_form(spec, values, back, forward):
+    """Az elküldött űrlap feldolgozása: mentés, ellenőrzés (csak Tovább esetén), oldalváltás."""
+    store_answers(spec.items, values)
+    if back:
+        go_to(spec.prev)
+    if forward and check_page(spec, values):
+        go_to(spec.next)
+
+
+# ---------- ÁLTALÁNOS RENDERELŐ ----------
+def render_item(item):
+    # a widget állapota csak az oldalon élő kulcs; visszalépéskor a tömör tárolóból töltjük vissza
+    if item.key not in st.session_state:
+        restored = st.session_state.answers.get(item)
+        if restored is None and item.widget == "slider":
+            restored = item.default
+        if restored is not None:
+            st.session_state[item.key] = restored
+
+    if item.widget == "slider":
+        return st.slider(item.label, min_value=item.options[0], max_value=item.options[-1],
+                         step=1, key=item.key)
+    if item.widget == "text_area":
+        return st.text_area(item.label, key=item.key)
+    return st.radio(item.label, item.options, index=item.index,
+                    horizontal=item.horizontal, key=item.key)
+
+
+def store_answers(items, values: dict):
+    """A válaszok a tömör tárolóba, tétel-azonosító szerint."""
+    answers = st.session_state.answers
+    for it in items:
+        answers.set(it, values[it.key])
+
+
+def page_header(spec):
+    progress_bar(spec.number, TOTAL_PAGES)
+    st.caption(f"Oldal {spec.number+1} / {TOTAL_PAGES}")
+    st.header(spec.header)
+
+
+# 0. oldal – Bevezető + Beleegyezés
+def render_consent(spec):
+    st.title(spec.header)
+    st.markdown(spec.intro)
+    progress_bar(0, TOTAL_PAGES)
 
-# 17. oldal – Demográfiai kérdések
-elif page == 18:
-    # belépési idő rögzítése
-    if f"page_{page}_entered" not in st.session_state.timestamps:
-        st.session_state.timestamps[f"page_{page}_entered"] = datetime.utcnow().isoformat()
+    values = {}
+    with st.form(f"form_{spec.number}", border=False):
+        for item in spec.items:
+            st.markdown(f"**{item.section}**")
+            values[item.key] = render_item(item)
+        back, forward = form_nav(spec, "Kezdés →")
+    submit_form(spec, values, back, forward)
 
-    progress_bar(page, TOTAL_PAGES)
-    st.caption(f"Oldal {page+1} / {TOTAL_PAGES}")
-    st.header("Demográfiai kérdések")
 
-    demo = {}
-    demo["Neme"] = st.radio(
-        "Kérjük, jelölje a nemét:",
-        ["Férfi", "Nő", "Egyéb / nem szeretném megadni"],
-        index=None, key="demo_gender"
-    )
-    demo["Életkora"] = st.radio(
-        "Kérjük, adja meg az életkorát:",
-        ["18–24 év", "25–34 év", "35–44 év", "45–54 év", "55 év vagy idősebb"],
-        index=None, key="demo_age"
-    )
-    demo["Legmagasabb iskolai végzettsége"] = st.radio(
-        "Kérjük, adja meg a legmagasabb iskolai végzettségét:",
-        ["Középiskola", "Felsőfokú tanulmányok folyamatban", "Egyetemi / főiskolai diploma", "Posztgraduális végzettség"],
-        index=None, key="demo_edu"
-    )
-    demo["Foglalkozása / státusza"] = st.radio(
-        "Kérjük, jelölje a foglalkozását / státuszát:",
-        ["Tanuló / hallgató", "Dolgozó alkalmazottként", "Vállalkozó", "Munkanélküli", "Egyéb"],
-        index=None, key="demo_job"
-    )
-    demo["Lakóhely típusa"] = st.radio(
-        "Kérjük, jelölje a lakóhelyének típusát:",
-        ["Főváros", "Megyeszékhely", "Egyéb város", "Község"],
-        index=None, key="demo_residence"
-    )
+# 1. oldal – Instrukciók
+def render_instructions(spec):
+    st.markdown(f"**{spec.header}**")
+    st.write(spec.intro)
 
-    st.session_state.answers["demographics"] = demo
+    if st.button("Tovább →"):
+        go_to(spec.next)
 
-# --- ÉRVÉNYESSÉG ELLENŐRZÉS ---
-    all_valid = True
 
-    for q, val in st.session_state.get("demographics", {}).items():
-     if val is None:
-        all_valid = False
+# 2–4. oldal – Ajánlatok (szöveges vagy képes csoport)
+def render_offer(spec):
+    page_header(spec)
+    st.subheader(spec.offer_title)
 
-    nav(prev=17, next=19, require_key="demographics")
-  
+    if st.session_state.group == "text":
+        show_offer_text(spec.offer)
+    else:
+        show_offer_image(spec.offer, use_container_width=True)
+
+    nav(spec)
+
+
+# 5–18. oldal – Kérdések (egy űrlap: a kattintások nem futtatják újra a szkriptet)
+def render_questions(spec):
+    page_header(spec)
+    if spec.intro:
+        st.write(spec.intro)
+    if spec.caption:
+        st.caption(spec.caption)
+
+    values, section = {}, None
+    with st.form(f"form_{spec.number}", border=False):
+        for item in spec.items:
+            if item.section and item.section != section:
+                section = item.section
+                st.subheader(section)
+            values[item.key] = render_item(item)
+        back, forward = form_nav(spec)
+    submit_form(spec, values, back, forward)
+
+
+RENDERERS = {
+    "consent": render_consent,
+    "instructions": render_instructions,
+    "offer": render_offer,
+    "questions": render_questions,
+}
 
 
+# ---------- OLDAL MEGJELENÍTÉSE (PAGES[page] → O(1)) ----------
+if page < TOTAL_PAGES:
+    spec = PAGES[page]
+    RENDERERS[spec.kind](spec)
+    mark_first_render()
+    finish_run(page)
 
 elif page == TOTAL_PAGES:
     st.success("Köszönjük a kitöltést! ✅")
     st.write("Köszönöm, hogy időt szánt a kérdőív kitöltésére.")
     st.write("Ha teheti, kérem ossza meg a kérdőívet másokkal is. 🙏")
 
-    record = {
-        "rid": st.session_state.rid,
-        "entered_at": st.session_state.entered_at,
-        "submitted_at": datetime.now().astimezone().isoformat(),
-        "group": st.session_state.group,
-    }
-
-    # --- válaszok külön oszlopokra ---
-    for q, ans in st.session_state.answers.items():
-        if isinstance(ans, dict):
-            for subq, subv in ans.items():
-                record[f"{q}_{subq}"] = subv
-        else:
-            record[q] = ans
-
-    # --- oldalak ideje ---
-    durations = calc_durations(st.session_state.timestamps)
-
-    record["duration_page_1"] = round(durations.get(1, 0), 2)
-    record["duration_page_2"] = round(durations.get(2, 0), 2)
-    record["duration_page_3"] = round(durations.get(3, 0), 2)
-    record["duration_page_4"] = round(durations.get(4, 0), 2)
-    record["duration_page_5"] = round(durations.get(5, 0), 2)
-    record["duration_page_6"] = round(durations.get(6, 0), 2)
-    record["duration_page_7"] = round(durations.get(7, 0), 2)
-    record["duration_page_8"] = round(durations.get(8, 0), 2)
-    record["duration_page_9"] = round(durations.get(9, 0), 2)
-    record["duration_page_10"] = round(durations.get(10, 0), 2)
-    record["duration_page_11"] = round(durations.get(11, 0), 2)
-    record["duration_page_12"] = round(durations.get(12, 0), 2)
-    record["duration_page_13"] = round(durations.get(13, 0), 2)
-    record["duration_page_14"] = round(durations.get(14, 0), 2)
-    record["duration_page_15"] = round(durations.get(15, 0), 2)
-    record["duration_page_16"] = round(durations.get(16, 0), 2)
-    record["duration_page_17"] = round(durations.get(17, 0), 2)
-    record["duration_page_18"] = round(durations.get(18, 0), 2)
-    record["duration_page_19"] = round(durations.get(19, 0), 2)
-
-
-
-    # --- MINDEN oldal időmérése ---
-    durations = calc_durations(st.session_state.timestamps)
-    for p, secs in durations.items():
-        record[f"duration_page_{p}"] = round(secs, 2)
-
-    # --- mentés ---
-    save_row(record)
-
+    if not st.session_state.get("submitted"):
+        record = {
+            "rid": st.session_state.rid,
+            "entered_at": st.session_state.entered_at,
+            "submitted_at": datetime.now().astimezone().isoformat(),
+            "group": st.session_state.group,
+        }
+
+        # --- válaszok: tétel-azonosítónként egy oszlop (a kérdésszöveg a kódtáblában) ---
+        record.update(st.session_state.answers.to_record())
+
+        # --- oldalak ideje (egy menetben, a monoton óra alapján) ---
+        timer = st.session_state.timer
+        record.update(timer.durations())
+        record["page_visits"] = list(timer.visits)
+        record["page_reruns"] = list(timer.reruns)
+
+        # --- mentés (rid szerint egyszer; frissítés / újracsatlakozás nem ír újra) ---
+        if save_row(record):
+            get_assigner().complete(st.session_state.group)
+            send_email_notification(record)
+            log_event("submit", TOTAL_PAGES)
+            get_metrics().submits.inc()
+        st.session_state.submitted = True
+        save_checkpoint()
+        get_metrics().live.forget(st.session_state.rid)
+        get_admission().release(st.session_state.token)
+        get_token_owners().release(st.session_state.token)
+        # a beküldés után a token nem marad a címsorban: a megosztott link új kitöltést indít
+        if "t" in st.query_params:
+            del st.query_params["t"]
+
+    finish_run(page)
     st.stop()
 
 
@@ -0,0 +1,64 @@
+# assets.py — folyamatszintű gyorsítótár az ajánlatok képeihez és szövegeihez
+# - minden elem egyszer töltődik be, utána kész bájtként / szövegként adjuk tovább
+# - memóriakeret: a legrégebben használt elemek kiesnek (LRU)
+# - találat / tévesztés / kiürítés számlálók
+
+import threading
+from collections import OrderedDict
+
+
+def _size_of(value) -> int:
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return 0
+
+
+class AssetCache:
+    """Szálbiztos LRU gyorsítótár bájtban megadott memóriakerettel."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()  # kulcs -> (érték, méret)
+        self._lock = threading.Lock()
+
+    def get(self, key, loader):
+        """Az elem a gyorsítótárból; ha nincs benne, a `loader()` tölti be egyszer."""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key][0]
+            self.misses += 1
+
+        # betöltés a zár nélkül: egy lassú fájlolvasás ne tartsa fel a többi munkamenetet
+        value = loader()
+        size = _size_of(value)
+        if size > self.max_bytes:
+            return value  # a keretnél nagyobb elemet nem tárolunk
+
+        with self._lock:
+            if key not in self._items:
+                self._items[key] = (value, size)
+                self.size += size
+                while self.size > self.max_bytes:
+                    _, (_, old_size) = self._items.popitem(last=False)
+                    self.size -= old_size
+                    self.evictions += 1
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "items": len(self._items),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,106 @@
+# assignment.py — kiegyensúlyozott csoportbesorolás (text / visual)
+# - permutált blokkok: minden blokkban minden csoport ugyanannyiszor szerepel, véletlen sorrendben,
+#   így a cellák eltérése bármikor legfeljebb fél blokknyi (a random.choice 10–15%-a helyett)
+# - a blokk és a számlálók közös SQLite fájlban vannak: több munkamenet és több folyamat
+#   (több Streamlit példány) is ugyanabból a sorozatból kap
+# - csoportonkénti kvóta a beküldött kitöltésekre (complete), nem a besorolásokra: a félbehagyott
+#   munkamenetek nem foglalnak helyet; a megtelt csoport kimarad a további blokkokból, ha minden
+#   csoport megtelt, a besorolás None (a már elkezdett kitöltések még beküldhetők, így a kvótát
+#   legfeljebb az épp folyamatban lévők száma lépheti túl)
+# - egy besorolás = egy rövid írási tranzakció, O(1), a blokk következő elemének kivétele
+
+import random
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+from survey import GROUPS
+
+ASSIGNMENT_PATH = Path("assignment.sqlite3")
+
+
+class GroupAssigner:
+    """Folyamatok között megosztott, zárral védett permutált-blokkos besoroló."""
+
+    def __init__(self, path=ASSIGNMENT_PATH, arms=GROUPS, block_size: int = 4,
+                 quotas: Optional[dict] = None, seed=None):
+        if block_size % len(arms):
+            raise ValueError("A blokkméretnek a csoportok számának többszörösének kell lennie.")
+        self.path = Path(path)
+        self.arms = tuple(arms)
+        self.block_size = block_size
+        self.quotas = dict(quotas or {})
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None,
+                                     timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS arm_counts ("
+                           " arm TEXT PRIMARY KEY, assigned INTEGER NOT NULL DEFAULT 0,"
+                           " completed INTEGER NOT NULL DEFAULT 0)")
+        cols = {r[1] for r in self._conn.execute("PRAGMA table_info(arm_counts)")}
+        if "completed" not in cols:  # korábbi fájl: csak besorolásokat számolt
+            self._conn.execute("ALTER TABLE arm_counts ADD COLUMN completed INTEGER NOT NULL DEFAULT 0")
+        # az aktuális blokk még ki nem osztott elemei, sorrendben
+        self._conn.execute("CREATE TABLE IF NOT EXISTS block ("
+                           " pos INTEGER PRIMARY KEY AUTOINCREMENT, arm TEXT NOT NULL)")
+        self._conn.executemany("INSERT OR IGNORE INTO arm_counts (arm) VALUES (?)",
+                               [(a,) for a in self.arms])
+
+    def _open_arms(self, counts: dict) -> list:
+        return [a for a in self.arms
+                if self.quotas.get(a) is None or counts.get(a, 0) < self.quotas[a]]
+
+    def _new_block(self, open_arms: list) -> list:
+        per_arm = self.block_size // len(self.arms)
+        block = [a for a in open_arms for _ in range(per_arm)]
+        self._rng.shuffle(block)
+        return block
+
+    def assign(self) -> Optional[str]:
+        """A következő csoport (vagy None, ha minden csoport kvótája betelt)."""
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")  # folyamatok között is kizárólagos, de csak pár ms
+            try:
+                counts = dict(cur.execute("SELECT arm, completed FROM arm_counts").fetchall())
+                open_arms = self._open_arms(counts)
+                if not open_arms:
+                    cur.execute("COMMIT")
+                    return None
+                marks = ",".join("?" * len(open_arms))
+                row = cur.execute(f"SELECT pos, arm FROM block WHERE arm IN ({marks})"
+                                  " ORDER BY pos LIMIT 1", open_arms).fetchone()
+                if row is None:
+                    # a régi blokk elfogyott (vagy csak lezárt csoportok maradtak benne)
+                    cur.execute("DELETE FROM block")
+                    cur.executemany("INSERT INTO block (arm) VALUES (?)",
+                                    [(a,) for a in self._new_block(open_arms)])
+                    row = cur.execute("SELECT pos, arm FROM block ORDER BY pos LIMIT 1").fetchone()
+                pos, arm = row
+                cur.execute("DELETE FROM block WHERE pos = ?", (pos,))
+                cur.execute("UPDATE arm_counts SET assigned = assigned + 1 WHERE arm = ?", (arm,))
+                cur.execute("COMMIT")
+                return arm
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+
+    def complete(self, arm):
+        """Egy beküldött kitöltés beszámítása a csoport kvótájába (a mentés után egyszer)."""
+        with self._lock:
+            self._conn.execute("UPDATE arm_counts SET completed = completed + 1 WHERE arm = ?", (arm,))
+
+    def counts(self) -> dict:
+        """Beküldött kitöltések csoportonként (ehhez mér a kvóta)."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT arm, completed FROM arm_counts").fetchall())
+
+    def assigned(self) -> dict:
+        """Besorolások csoportonként (a félbehagyottakkal együtt)."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT arm, assigned FROM arm_counts").fetchall())
+
+    def is_full(self) -> bool:
+        return not self._open_arms(self.counts())
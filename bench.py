@@ -0,0 +1,202 @@
+# bench.py — oldalankénti rerun-idő mérése Streamlit AppTest-tel (böngésző nélkül)
+# - egy szintetikus kitöltő végigmegy a 0–19. oldalon, mindkét csoportban (text / visual)
+# - oldalanként mérjük a widget-kattintás rerunját és a továbblépést: falióra-idő + foglalt memória
+#   (az űrlapos oldalakon a widgetek nem futtatnak újra: ott csak a beküldés rerunja van)
+# - az eredmény gépi formában a bench_output.txt-be kerül (JSON)
+# - ha egy oldal a tárolt alapértékhez (bench_baseline.json) képest túl lassú, hibakóddal lép ki
+# használat:
+#   python bench.py                      # mérés + összevetés az alapértékkel
+#   python bench.py --rounds 5           # több kör, oldalanként medián
+#   python bench.py --update-baseline    # az aktuális mérés lesz az új alapérték
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from survey import GROUPS, PAGES, TOTAL_PAGES
+
+BASE_DIR = Path(__file__).parent
+APP_PATH = BASE_DIR / "appúj.py"
+OUTPUT_PATH = BASE_DIR / "bench_output.txt"
+BASELINE_PATH = BASE_DIR / "bench_baseline.json"
+
+# st.form-ban megjelenített oldalak: a válaszok a beküldő gombbal, egyetlen rerunban mennek el
+FORM_KINDS = ("consent", "questions")
+
+# érvényes válaszok ott, ahol az oldal saját ellenőrzése megköti az értéket
+FIXED_ANSWERS = {
+    "consent_0": "Igen",
+    "decision_choice": "Prága",
+    "decision_count": 1,
+    "attention_check": "Harmadik",
+}
+
+
+def synthetic_answers(rng=None) -> dict:
+    """Egy érvényes kitöltés: {widget-kulcs: érték} minden kérdésre."""
+    rng = rng or random.Random(0)
+    values = {}
+    for spec in PAGES:
+        for it in spec.items:
+            if it.key in FIXED_ANSWERS:
+                values[it.key] = FIXED_ANSWERS[it.key]
+            elif it.widget == "text_area":
+                values[it.key] = "Az ár és a város hangulata."
+            else:
+                values[it.key] = rng.choice(it.options)
+    return values
+
+
+def fill_page(at, spec, values):
+    """Az oldal összes widgetjének beállítása (a következő run() egyetlen rerunban küldi el)."""
+    for it in spec.items:
+        if it.widget == "slider":
+            at.slider(key=it.key).set_value(values[it.key])
+        elif it.widget == "text_area":
+            at.text_area(key=it.key).input(values[it.key])
+        else:
+            at.radio(key=it.key).set_value(values[it.key])
+
+
+def next_button(at, spec):
+    """A továbblépő gomb: űrlapos oldalon a form_<n> beküldő gombja (kulcsa
+    "FormSubmitter:form_<n>-<felirat>"), máshol a next_<n>_… kulcsú vagy kulcs nélküli gomb."""
+    labels = ("Kezdés →", "Tovább →")
+    prefixes = (f"next_{spec.number}_", f"FormSubmitter:form_{spec.number}-")
+    for b in at.button:
+        if b.label in labels and (b.key is None or b.key.startswith(prefixes)):
+            return b
+    raise RuntimeError(f"{spec.number}. oldal: nincs továbblépő gomb")
+
+
+def timed_run(at):
+    """Egy at.run() mérése: (ms, a rerun alatt foglalt memória csúcsa KB-ban)."""
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter_ns()
+    at.run()
+    elapsed = (time.perf_counter_ns() - t0) / 1e6
+    peak = tracemalloc.get_traced_memory()[1]
+    if at.exception:
+        raise RuntimeError(f"Hiba a futás közben: {at.exception[0].value}")
+    return elapsed, max(0, peak - before) / 1024
+
+
+def run_respondent(group: str, values: dict, timeout: float = 30) -> dict:
+    """Egy teljes kitöltés; oldalanként {interact_ms (csak űrlap nélkül), next_ms, alloc_kb}."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+    at.session_state["group"] = group
+    at.run()
+
+    results = {}
+    for spec in PAGES:
+        if at.session_state["page"] != spec.number:
+            raise RuntimeError(f"Várt oldal: {spec.number}, aktuális: {at.session_state['page']}")
+        row = {}
+        if spec.items:
+            fill_page(at, spec, values)
+            if spec.kind not in FORM_KINDS:
+                row["interact_ms"], row["interact_alloc_kb"] = timed_run(at)
+        next_button(at, spec).click()
+        row["next_ms"], row["next_alloc_kb"] = timed_run(at)
+        results[str(spec.number)] = row
+
+    # a köszönőoldal újratöltése (frissítés / újracsatlakozás)
+    if at.session_state["page"] != TOTAL_PAGES:
+        raise RuntimeError("A kitöltő nem jutott el a köszönőoldalig.")
+    ms, kb = timed_run(at)
+    results[str(TOTAL_PAGES)] = {"next_ms": ms, "next_alloc_kb": kb}
+    return results
+
+
+def summarize(rounds: list) -> dict:
+    """Körök → oldalanként medián (a zajos első futásokat is kisimítja)."""
+    out = {}
+    for page in rounds[0]:
+        out[page] = {
+            metric: round(statistics.median(r[page][metric] for r in rounds), 3)
+            for metric in rounds[0][page]
+        }
+    return out
+
+
+def compare(report: dict, baseline: dict, tolerance: float, slack_ms: float) -> list:
+    """Regressziók: ahol az idő > alapérték * (1 + tolerance) + slack_ms."""
+    problems = []
+    for group, pages in report["pages"].items():
+        for page, metrics in pages.items():
+            base = baseline.get("pages", {}).get(group, {}).get(page, {})
+            for metric in ("interact_ms", "next_ms"):
+                if metric in metrics and metric in base:
+                    limit = base[metric] * (1 + tolerance) + slack_ms
+                    if metrics[metric] > limit:
+                        problems.append(f"{group} / {page}. oldal / {metric}: "
+                                        f"{metrics[metric]:.1f} ms > {limit:.1f} ms (alap: {base[metric]:.1f})")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Oldalankénti rerun-idő mérése (AppTest).")
+    parser.add_argument("--rounds", type=int, default=3, help="körök száma csoportonként")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="megengedett relatív lassulás")
+    parser.add_argument("--slack-ms", type=float, default=5.0, help="abszolút zajtűrés ms-ban")
+    parser.add_argument("--output", default=str(OUTPUT_PATH))
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    values = synthetic_answers()
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rounds": args.rounds,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "pages": {},
+    }
+
+    # külön munkakönyvtár: a mérés ne írjon a valódi válasz-adatbázisba
+    cwd = os.getcwd()
+    tracemalloc.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            for group in GROUPS:
+                rounds = [run_respondent(group, values) for _ in range(args.rounds)]
+                report["pages"][group] = summarize(rounds)
+        finally:
+            os.chdir(cwd)
+    tracemalloc.stop()
+
+    Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Eredmény: {args.output}")
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Új alapérték: {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print("Nincs alapérték (futtassa --update-baseline kapcsolóval).")
+        return 0
+
+    problems = compare(report, json.loads(baseline_path.read_text(encoding="utf-8")),
+                       args.tolerance, args.slack_ms)
+    for p in problems:
+        print("LASSULÁS:", p)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
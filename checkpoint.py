@@ -0,0 +1,203 @@
+# checkpoint.py — félbehagyott kitöltések mentése és folytatása
+# - oldalváltáskor a munkamenet tömör állapota (válaszkódok + oldalidők, ~1 KB) egyetlen
+#   UPSERT-tel kerül a helyi SQLite-ba, a URL-ben lévő folytatási token (?t=...) kulcsával
+# - újratöltés / megszakadt kapcsolat után egyetlen kereséssel visszaáll a munkamenet
+# - egy tokent egyszerre egy nyitott munkamenet használhat (TokenOwners): egy továbbküldött
+#   link új kitöltést indít, nem a másik ember félkész (vagy beküldött) válaszait folytatja;
+#   a tulajdonos és egy szívverés-időpont a közös sorban van, így több app-folyamat között is érvényes
+
+import secrets
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from answers import AnswerSheet
+from survey import TOTAL_PAGES
+from timing import PageTimer
+
+CHECKPOINT_PATH = Path("checkpoints.sqlite3")
+
+
+def new_token() -> str:
+    return secrets.token_urlsafe(16)
+
+
+class CheckpointStore:
+    """Folytatási pontok tokenenként (egy sor / kitöltés, felülírva)."""
+
+    def __init__(self, path=CHECKPOINT_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # egy félbehagyott kitöltés elvesztése nem kritikus: nincs fsync minden oldalnál
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            " token TEXT PRIMARY KEY,"
+            " rid TEXT NOT NULL,"
+            " grp TEXT NOT NULL,"
+            " page INTEGER NOT NULL,"
+            " entered_at TEXT,"
+            " codes BLOB NOT NULL,"
+            " texts TEXT NOT NULL,"
+            " timer BLOB NOT NULL,"
+            " submitted INTEGER NOT NULL DEFAULT 0,"
+            " updated_at REAL NOT NULL,"
+            " owner TEXT,"
+            " heartbeat REAL)"
+        )
+        cols = {r[1] for r in self._conn.execute("PRAGMA table_info(checkpoints)")}
+        for col, kind in (("owner", "TEXT"), ("heartbeat", "REAL")):
+            if col not in cols:  # korábbi fájl, tulajdonos nélkül
+                self._conn.execute(f"ALTER TABLE checkpoints ADD COLUMN {col} {kind}")
+
+    def save(self, token, rid, group, page, entered_at, answers: AnswerSheet,
+             timer: PageTimer, submitted=False, owner=None):
+        """Mentés; az `owner` csak az első mentéskor (új token) kerül a sorba, utána a claim dönt."""
+        codes, texts = answers.dump()
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO checkpoints (token, rid, grp, page, entered_at, codes, texts, timer,"
+                " submitted, updated_at, owner, heartbeat) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(token) DO UPDATE SET page = excluded.page, codes = excluded.codes,"
+                " texts = excluded.texts, timer = excluded.timer, submitted = excluded.submitted,"
+                " updated_at = excluded.updated_at",
+                (token, rid, group, page, entered_at, codes, texts, timer.dump(),
+                 int(submitted), now, owner, now),
+            )
+
+    def claim(self, token, owner, lease_s: float) -> bool:
+        """A token átvétele, ha nincs gazdája, már ezé, vagy a gazda szívverése lejárt (feltételes UPDATE)."""
+        now = time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE checkpoints SET owner = ?, heartbeat = ? WHERE token = ?"
+                " AND (owner IS NULL OR owner = ? OR heartbeat IS NULL OR heartbeat < ?)",
+                (owner, now, token, owner, now - lease_s),
+            )
+            return cur.rowcount == 1
+
+    def heartbeat(self, pairs):
+        """(token, owner) párok: a még nyitott munkamenetek szívverésének frissítése."""
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE checkpoints SET heartbeat = ? WHERE token = ? AND owner = ?",
+                [(time.time(), token, owner) for token, owner in pairs],
+            )
+
+    def release(self, token, owner):
+        """A token elengedése (bezárt munkamenet vagy beküldés): más azonnal átveheti."""
+        with self._lock:
+            self._conn.execute("UPDATE checkpoints SET owner = NULL WHERE token = ? AND owner = ?",
+                               (token, owner))
+
+    def load(self, token):
+        """A tokenhez tartozó munkamenet-állapot (session_state kulcsok) vagy None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rid, grp, page, entered_at, codes, texts, timer, submitted"
+                " FROM checkpoints WHERE token = ?", (token,)
+            ).fetchone()
+        if row is None:
+            return None
+        rid, group, page, entered_at, codes, texts, timer, submitted = row
+        try:
+            answers = AnswerSheet.load(codes, texts)
+            timer = PageTimer.load(timer, TOTAL_PAGES + 1)
+        except ValueError:
+            return None  # a kérdőív azóta megváltozott: új kitöltés indul
+        return {
+            "rid": rid,
+            "group": group,
+            "page": page,
+            "entered_at": entered_at,
+            "answers": answers,
+            "timer": timer,
+            "submitted": bool(submitted),
+        }
+
+    def purge(self, older_than_s: float):
+        """A régi (pl. egy hétnél régebbi) folytatási pontok törlése."""
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoints WHERE updated_at < ?",
+                               (time.time() - older_than_s,))
+
+
+class TokenOwners:
+    """A folyamat munkameneteinek tokenjei a közös CheckpointStore-ban, szívveréssel.
+
+    Egy háttérszál `beat_s` másodpercenként frissíti a még nyitott munkamenetek szívverését,
+    és elengedi a bezártakét (`is_alive(session_id)`, pl. a Streamlit futtatókörnyezetéből;
+    ha hibát dob, a munkamenet nyitottnak számít). Így egy újratöltés (a régi munkamenet
+    bezárult) pár másodpercen belül bármelyik folyamatban folytathat, egy megosztott link
+    viszont, amíg az eredeti nyitva van, nem. Egy összeomlott folyamat tokenjei `lease_s`
+    után szabadulnak fel.
+    """
+
+    def __init__(self, store: CheckpointStore, is_alive=None, beat_s: float = 2, lease_s: float = 15):
+        self.store = store
+        self.is_alive = is_alive
+        self.beat_s = beat_s
+        self.lease_s = lease_s
+        self._mine = {}  # token -> munkamenet-azonosító (ebben a folyamatban)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def own(self, token, session_id):
+        """Új token nyilvántartása (a tulajdonost az első save(owner=...) írja a sorba)."""
+        with self._lock:
+            self._mine[token] = session_id
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="token-heartbeat", daemon=True)
+                self._thread.start()
+
+    def claim(self, token, session_id, wait_s: float = None) -> bool:
+        """Meglévő token átvétele; False, ha közben is egy másik, nyitott munkamenet használja.
+
+        Legfeljebb `wait_s` ideig (alap: két szívverésnyi) újrapróbálja: újratöltéskor a régi
+        munkamenet folyamatának ennyi kell, hogy a bezárást észrevegye és a tokent elengedje.
+        """
+        deadline = time.monotonic() + (2 * self.beat_s + 1 if wait_s is None else wait_s)
+        while True:
+            with self._lock:
+                previous = self._mine.get(token)
+            if previous is not None and previous != session_id and not self._alive(previous):
+                self.store.release(token, previous)  # ugyanebben a folyamatban zárult be
+            if self.store.claim(token, session_id, self.lease_s):
+                self.own(token, session_id)
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.5)
+
+    def release(self, token):
+        with self._lock:
+            session_id = self._mine.pop(token, None)
+        if session_id is not None:
+            self.store.release(token, session_id)
+
+    def _alive(self, session_id) -> bool:
+        if self.is_alive is None:
+            return True
+        try:
+            return bool(self.is_alive(session_id))
+        except Exception:
+            return True
+
+    def _run(self):
+        while True:
+            time.sleep(self.beat_s)
+            with self._lock:
+                mine = list(self._mine.items())
+            alive = [(t, s) for t, s in mine if self._alive(s)]
+            try:
+                if alive:
+                    self.store.heartbeat(alive)
+                for token, session_id in mine:
+                    if (token, session_id) not in alive:
+                        self.release(token)
+            except Exception:
+                pass  # átmeneti zárolás: a következő ütemben újra
@@ -0,0 +1,182 @@
+# events.py — oldalszintű eseménynapló és lemorzsolódási tölcsér
+# - minden navigációs esemény (belépés, kilépés, vissza, sikertelen ellenőrzés, beküldés)
+#   egy memóriabeli pufferbe kerül; egy háttérszál másodpercenként kiírja és fsync-eli (JSONL)
+# - a tölcsér a naplóból növekményesen számolódik: csak az utolsó olvasás óta új sorokat dolgozza fel
+# - a lemorzsolódás időben is: óránként és oldalanként, a félbehagyók utolsó eseménye szerint
+# használat:  python events.py [--log events.jsonl] [--idle 30]
+
+import argparse
+import atexit
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+EVENTS_PATH = Path("events.jsonl")
+EVENT_TYPES = ("enter", "leave", "back", "invalid", "submit")
+
+
+class EventLog:
+    """Pufferelt, csak hozzáfűző eseménynapló időszakos fsync-kel."""
+
+    def __init__(self, path=EVENTS_PATH, flush_interval: float = 1.0):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log(self, type_: str, page: int, rid: str, group: str = None, **extra):
+        """Esemény felvétele a pufferbe (nem ír lemezre, nem blokkol)."""
+        event = {"ts": round(time.time(), 3), "type": type_, "page": page, "rid": rid}
+        if group is not None:
+            event["group"] = group
+        event.update(extra)
+        line = json.dumps(event, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._buffer.append(line)
+
+    def flush(self):
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+        if not lines:
+            return
+        with self._write_lock:
+            # egyetlen write() egész sorokkal: több folyamat is írhat ugyanabba a fájlba
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, "".join(lines).encode("utf-8"))
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError:
+                pass  # a következő körben újra próbálkozik
+
+
+class Funnel:
+    """Növekményes tölcsér: oldalanként elért és ott lemorzsolódott kitöltők, óránkénti idővonal."""
+
+    def __init__(self, path=EVENTS_PATH, idle_s: float = 30 * 60):
+        self.path = Path(path)
+        self.idle_s = idle_s
+        self.offset = 0
+        self.reached = defaultdict(set)   # oldal -> rid-ek, akik beléptek
+        self.invalid = defaultdict(int)   # oldal -> sikertelen továbblépések
+        self.last = {}                    # rid -> (utolsó oldal, utolsó esemény ideje)
+        self.submitted = set()
+        self.starts_by_hour = defaultdict(int)
+        self.submits_by_hour = defaultdict(int)
+
+    @staticmethod
+    def _hour(ts) -> str:
+        return time.strftime("%Y-%m-%d %H:00", time.localtime(ts))
+
+    def update(self) -> int:
+        """Az utolsó hívás óta hozzáfűzött események feldolgozása; visszaadja a számukat."""
+        if not self.path.exists():
+            return 0
+        n = 0
+        with open(self.path, "rb") as fh:
+            fh.seek(self.offset)
+            for raw in fh:
+                if not raw.endswith(b"\n"):
+                    break  # félig kiírt sor: a következő frissítéskor olvassuk
+                self.offset += len(raw)
+                self._apply(json.loads(raw))
+                n += 1
+        return n
+
+    def _apply(self, ev):
+        rid, page, ts = ev["rid"], ev["page"], ev["ts"]
+        hour = self._hour(ts)
+        if ev["type"] == "enter":
+            if page == 0 and rid not in self.reached[0]:
+                self.starts_by_hour[hour] += 1
+            self.reached[page].add(rid)
+        elif ev["type"] == "invalid":
+            self.invalid[page] += 1
+        elif ev["type"] == "submit":
+            self.submitted.add(rid)
+            self.submits_by_hour[hour] += 1
+        # több folyamat / puffer esetén a sorrend nem szigorú: a legkésőbbi esemény számít
+        if rid not in self.last or ts >= self.last[rid][1]:
+            self.last[rid] = (page, ts)
+
+    def report(self, now: float = None) -> dict:
+        """Oldalanként: elérte / ott hagyta abba (tétlen > idle_s) / még aktív / sikertelen próbák.
+
+        abandoned_by_hour: {óra: {oldal: db}} – a félbehagyott kitöltések az utolsó eseményük
+        órája és oldala szerint, így a lemorzsolódás alakulása is látszik, nem csak az összeg.
+        """
+        now = time.time() if now is None else now
+        abandoned, active = defaultdict(int), defaultdict(int)
+        abandoned_by_hour = defaultdict(lambda: defaultdict(int))
+        for rid, (page, ts) in self.last.items():
+            if rid in self.submitted:
+                continue
+            if now - ts > self.idle_s:
+                abandoned[page] += 1
+                abandoned_by_hour[self._hour(ts)][page] += 1
+            else:
+                active[page] += 1
+        pages = sorted(set(self.reached) | set(abandoned) | set(active))
+        return {
+            "pages": {
+                p: {
+                    "reached": len(self.reached.get(p, ())),
+                    "abandoned": abandoned[p],
+                    "active": active[p],
+                    "invalid": self.invalid.get(p, 0),
+                }
+                for p in pages
+            },
+            "started": len(self.reached.get(0, ())),
+            "submitted": len(self.submitted),
+            "starts_by_hour": dict(sorted(self.starts_by_hour.items())),
+            "submits_by_hour": dict(sorted(self.submits_by_hour.items())),
+            "abandoned_by_hour": {h: dict(sorted(by_page.items()))
+                                  for h, by_page in sorted(abandoned_by_hour.items())},
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lemorzsolódási tölcsér az eseménynaplóból.")
+    parser.add_argument("--log", default=str(EVENTS_PATH), help="az eseménynapló útvonala")
+    parser.add_argument("--idle", type=float, default=30, help="ennyi perc tétlenség után lemorzsolódott")
+    args = parser.parse_args(argv)
+
+    funnel = Funnel(args.log, idle_s=args.idle * 60)
+    funnel.update()
+    rep = funnel.report()
+    print(f"elkezdte: {rep['started']}, beküldte: {rep['submitted']}")
+    print(f"{'oldal':>5} {'elérte':>7} {'abbahagyta':>11} {'aktív':>6} {'hibás':>6}")
+    for p, row in rep["pages"].items():
+        print(f"{p:>5} {row['reached']:>7} {row['abandoned']:>11} {row['active']:>6} {row['invalid']:>6}")
+    if rep["abandoned_by_hour"]:
+        print()
+        print(f"{'óra':<16} {'kezdte':>6} {'beküldte':>8} {'abbahagyta':>10}  oldalanként")
+        for hour in sorted(set(rep["starts_by_hour"]) | set(rep["abandoned_by_hour"])):
+            by_page = rep["abandoned_by_hour"].get(hour, {})
+            pages = " ".join(f"{p}:{n}" for p, n in by_page.items())
+            print(f"{hour:<16} {rep['starts_by_hour'].get(hour, 0):>6} "
+                  f"{rep['submits_by_hour'].get(hour, 0):>8} {sum(by_page.values()):>10}  {pages}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+# export.py — a válasz-adatbázis exportálása
+# - XLSX (kutatóknak, kódtáblával) és CSV: folyamatosan, soronként írva, állandó memóriával
+# - Parquet / Arrow (elemzéshez): explicit séma, Likert = int8, csoport és választások =
+#   kategória, időpontok = valódi timestamp; soronként csoportokban írva (row group)
+# - létező fájlt csak --force mellett ír felül (a régi, élő responses.xlsx se vesszen el)
+# használat:
+#   python export.py [responses_export.xlsx] [--db responses.sqlite3] [--force]
+#   python export.py responses.csv
+#   python export.py responses.parquet
+#   python export.py responses.arrow
+# olvasás (oszlop- és predikátumszűréssel):
+#   pd.read_parquet("responses.parquet", columns=["rid", "group", "aias_1"],
+#                   filters=[("group", "==", "visual")])
+
+import argparse
+import csv
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from storage import DB_PATH, ResponseStore, open_store, order_columns
+from survey import GROUPS, ITEMS, PAGES, TOTAL_PAGES
+
+EXPORT_PATH = Path("responses_export.xlsx")  # nem a régi app responses.xlsx-e
+
+
+def export_columns(store: ResponseStore) -> list:
+    """Első menet: az összes előforduló oszlop (csak a nevek kerülnek memóriába), rendezve."""
+    seen = {}
+    for _, row in store.iter_rows():
+        seen.update(dict.fromkeys(row))
+    return order_columns(list(seen))
+
+
+def iter_values(store: ResponseStore, columns):
+    """Második menet: soronként az értékek a megadott oszlopsorrendben (hiányzó = üres)."""
+    for _, row in store.iter_rows():
+        yield [row.get(c) for c in columns]
+
+
+def export_xlsx(store: ResponseStore, path=EXPORT_PATH) -> int:
+    """Az összes sor kiírása XLSX-be (+ kódtábla lap); visszaadja a sorok számát.
+
+    Az openpyxl write-only módja soronként lemezre ír, így a memóriahasználat nem függ
+    a sorok számától.
+    """
+    from openpyxl import Workbook
+
+    columns = export_columns(store)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("valaszok")
+    ws.append(columns)
+    n = 0
+    for values in iter_values(store, columns):
+        ws.append(values)
+        n += 1
+    cb = wb.create_sheet("kodtabla")
+    cb.append(CODEBOOK_COLS)
+    for rec in codebook_rows():
+        cb.append([rec[c] for c in CODEBOOK_COLS])
+    wb.save(path)
+    return n
+
+
+def export_csv(store: ResponseStore, path) -> int:
+    """Ugyanaz CSV-be (UTF-8 BOM-mal, hogy az Excel jól nyissa meg az ékezeteket)."""
+    columns = export_columns(store)
+    n = 0
+    with open(path, "w", newline="", encoding="utf-8-sig") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(columns)
+        for values in iter_values(store, columns):
+            writer.writerow(values)
+            n += 1
+    return n
+
+
+CODEBOOK_COLS = ["azonosito", "oldal", "blokk", "kerdes", "lehetosegek"]
+
+
+def codebook_rows() -> list:
+    """Kódtábla: az oszlopok (tétel-azonosítók) feloldása kérdésszövegre és lehetőségekre."""
+    rows = []
+    for spec in PAGES:
+        for it in spec.items:
+            rows.append({
+                "azonosito": it.id,
+                "oldal": spec.number,
+                "blokk": it.group or "",
+                "kerdes": it.label,
+                "lehetosegek": " | ".join(str(o) for o in it.options),
+            })
+    return rows
+
+
+# ---------- OSZLOPOS EXPORT (Parquet / Arrow) ----------
+DURATION_COLS = [f"duration_page_{i}" for i in range(TOTAL_PAGES + 1)]
+
+
+def _is_int_scale(options) -> bool:
+    return bool(options) and all(isinstance(o, int) for o in options)
+
+
+def arrow_schema():
+    """Explicit séma: azonosítók, időpontok, oldalidők, majd a tételek a kérdőív sorrendjében."""
+    import pyarrow as pa
+
+    categorical = pa.dictionary(pa.int8(), pa.string())
+    fields = [
+        pa.field("rid", pa.string(), nullable=False),
+        pa.field("entered_at", pa.timestamp("us", tz="UTC")),
+        pa.field("submitted_at", pa.timestamp("us", tz="UTC")),
+        pa.field("group", categorical),
+    ]
+    fields += [pa.field(c, pa.float32()) for c in DURATION_COLS]
+    fields += [pa.field("page_visits", pa.list_(pa.int16())),
+               pa.field("page_reruns", pa.list_(pa.int16()))]
+    for it in ITEMS:
+        if it.widget == "text_area":
+            fields.append(pa.field(it.id, pa.string()))
+        elif _is_int_scale(it.options):
+            fields.append(pa.field(it.id, pa.int8()))
+        else:
+            fields.append(pa.field(it.id, categorical))
+    return pa.schema(fields)
+
+
+def _timestamp(value):
+    if not value:
+        return None
+    ts = datetime.fromisoformat(value)
+    # az entered_at időzóna nélküli UTC, a submitted_at helyi idő időzónával
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts.astimezone(timezone.utc)
+
+
+def _int_list(value):
+    if value is None:
+        return None
+    return json.loads(value) if isinstance(value, str) else list(value)
+
+
+def _categorical(values, categories):
+    """Rögzített kategóriasorrendű szótáras tömb (minden row groupban ugyanaz a szótár)."""
+    import pyarrow as pa
+
+    lookup = {c: i for i, c in enumerate(categories)}
+    indices = pa.array([lookup.get(v) for v in values], type=pa.int8())
+    return pa.DictionaryArray.from_arrays(indices, pa.array([str(c) for c in categories]))
+
+
+def _record_batch(rows, schema):
+    import pyarrow as pa
+
+    def col(name):
+        return [r.get(name) for r in rows]
+
+    arrays = [
+        pa.array(col("rid"), pa.string()),
+        pa.array([_timestamp(v) for v in col("entered_at")], schema.field("entered_at").type),
+        pa.array([_timestamp(v) for v in col("submitted_at")], schema.field("submitted_at").type),
+        _categorical(col("group"), GROUPS),
+    ]
+    arrays += [pa.array(col(c), pa.float32()) for c in DURATION_COLS]
+    arrays += [pa.array([_int_list(v) for v in col(c)], pa.list_(pa.int16()))
+               for c in ("page_visits", "page_reruns")]
+    for it in ITEMS:
+        if it.widget == "text_area":
+            arrays.append(pa.array(col(it.id), pa.string()))
+        elif _is_int_scale(it.options):
+            arrays.append(pa.array(col(it.id), pa.int8()))
+        else:
+            arrays.append(_categorical(col(it.id), it.options))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def export_columnar(store: ResponseStore, path, fmt="parquet", batch_size=10_000) -> int:
+    """Parquet vagy Arrow IPC fájl; batch_size soronként ír, így a memória nem nő a sorszámmal.
+
+    A sémán kívüli oszlopok (ha lennének) kimaradnak.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = arrow_schema()
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(path, schema, compression="zstd")
+        write = writer.write_batch
+    else:
+        writer = pa.ipc.new_file(path, schema)
+        write = writer.write_batch
+
+    n, batch = 0, []
+    try:
+        for _, row in store.iter_rows():
+            batch.append(row)
+            if len(batch) >= batch_size:
+                write(_record_batch(batch, schema))
+                n += len(batch)
+                batch = []
+        if batch:
+            write(_record_batch(batch, schema))
+            n += len(batch)
+    finally:
+        writer.close()
+    return n
+
+
+FORMATS = {".xlsx": "xlsx", ".csv": "csv", ".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Válaszok exportálása (XLSX / CSV / Parquet / Arrow).")
+    parser.add_argument("out", nargs="?", default=str(EXPORT_PATH), help="kimeneti fájl")
+    parser.add_argument("--db", default=str(DB_PATH),
+                        help="a válasz-tár útvonala vagy URL-je (lásd storage.open_store)")
+    parser.add_argument("--format", choices=sorted(set(FORMATS.values())),
+                        help="alapból a kiterjesztés alapján")
+    parser.add_argument("--force", action="store_true", help="létező kimeneti fájl felülírása")
+    args = parser.parse_args(argv)
+    fmt = args.format or FORMATS.get(Path(args.out).suffix.lower(), "xlsx")
+    if Path(args.out).exists() and not args.force:
+        parser.error(f"{args.out} már létezik; felülíráshoz: --force")
+
+    store = open_store(args.db)
+    if fmt == "xlsx":
+        n = export_xlsx(store, args.out)
+    elif fmt == "csv":
+        n = export_csv(store, args.out)
+    else:
+        n = export_columnar(store, args.out, fmt)
+    store.close()
+    print(f"{n} sor exportálva: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# images.py — az ajánlatképek kisebb, újratömörített változatai
+# - több szélességben WebP és JPEG, a static/img mappába (Streamlit statikus kiszolgálás)
+# - csak akkor készül újra, ha az eredeti kép frissebb a változatnál; ha minden változat kész,
+#   az eredeti képet meg sem nyitja (csak a fájlidőket nézi)
+# - a böngésző a srcset alapján a kijelzőhöz illő legkisebbet tölti le
+# használat (build lépés):  python images.py
+
+import html
+import logging
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).parent
+STATIC_DIR = BASE_DIR / "static" / "img"
+STATIC_URL = "app/static/img"  # .streamlit/config.toml: enableStaticServing = true
+
+WIDTHS = (480, 800, 1200)
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 6}),
+    "jpg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+# "centered" elrendezés: a tartalom legfeljebb ~704 px széles
+SIZES = "(max-width: 736px) 100vw, 704px"
+
+
+def _ready_variants(src: Path, out_dir: Path):
+    """A meglévő változatok, ha mind frissebb az eredetinél és a szélességek teljesek; különben None."""
+    mtime = src.stat().st_mtime
+    variants = {}
+    for ext in FORMATS:
+        found = []
+        for out in out_dir.glob(f"{src.stem}-*.{ext}"):
+            w = out.stem[len(src.stem) + 1:]
+            if not w.isdigit():
+                continue
+            if out.stat().st_mtime < mtime:
+                return None
+            found.append((int(w), out.name))
+        if not found:
+            return None
+        found.sort()
+        top = found[-1][0]  # a legnagyobb változat az eredeti kép szélessége
+        if [w for w, _ in found] != sorted({w for w in WIDTHS if w < top} | {top}):
+            return None
+        variants[ext] = found
+    return variants
+
+
+def build_variants(src, out_dir=STATIC_DIR) -> dict:
+    """Egy kép átméretezett változatai: {formátum: [(szélesség, fájlnév), ...]}."""
+    src = BASE_DIR / src
+    if out_dir.is_dir():
+        ready = _ready_variants(src, out_dir)
+        if ready is not None:
+            return ready
+
+    from PIL import Image
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    variants = {ext: [] for ext in FORMATS}
+    with Image.open(src) as img:
+        img = img.convert("RGB")
+        widths = [w for w in WIDTHS if w < img.width] + [img.width]
+        for w in sorted(set(widths)):
+            resized = None
+            for ext, (fmt, opts) in FORMATS.items():
+                out = out_dir / f"{src.stem}-{w}.{ext}"
+                if not out.exists() or out.stat().st_mtime < src.stat().st_mtime:
+                    if resized is None:
+                        h = round(img.height * w / img.width)
+                        resized = img.resize((w, h), Image.LANCZOS)
+                    resized.save(out, fmt, **opts)
+                variants[ext].append((w, out.name))
+    return variants
+
+
+def build_all(images: dict) -> dict:
+    """Az összes ajánlatkép változatai; ha egy kép nem dolgozható fel, kimarad (marad az eredeti)."""
+    result = {}
+    for name, src in images.items():
+        try:
+            result[name] = build_variants(src)
+        except Exception:
+            log.warning("Képváltozatok készítése sikertelen: %s", src, exc_info=True)
+    return result
+
+
+def fallback_file(variants: dict, max_width: int = 1200) -> Path:
+    """Statikus kiszolgálás nélkül: a legnagyobb, legfeljebb `max_width` széles JPEG változat."""
+    fitting = [v for v in variants["jpg"] if v[0] <= max_width] or variants["jpg"][:1]
+    return STATIC_DIR / fitting[-1][1]
+
+
+def picture_html(variants: dict, caption: str) -> str:
+    """<picture> elem srcset-tel: WebP, ha a böngésző tudja, különben JPEG."""
+    def srcset(ext):
+        return ", ".join(f"{STATIC_URL}/{name} {w}w" for w, name in variants[ext])
+
+    fallback = f"{STATIC_URL}/{variants['jpg'][0][1]}"
+    alt = html.escape(caption)
+    return (
+        '<figure style="margin:0">'
+        "<picture>"
+        f'<source type="image/webp" srcset="{srcset("webp")}" sizes="{SIZES}">'
+        f'<img src="{fallback}" srcset="{srcset("jpg")}" sizes="{SIZES}" alt="{alt}" '
+        'style="width:100%;height:auto">'
+        "</picture>"
+        f'<figcaption style="text-align:center;font-size:0.875rem;opacity:0.6">{alt}</figcaption>'
+        "</figure>"
+    )
+
+
+if __name__ == "__main__":
+    for src in sorted(BASE_DIR.glob("*.png")):
+        v = build_variants(src.name)
+        print(src.name, ", ".join(f"{w}px" for w, _ in v["jpg"]))
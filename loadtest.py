@@ -0,0 +1,215 @@
+# loadtest.py — terheléses próba: N egyidejű kitöltő ugyanazon a válasz-táron
+# - minden egyidejű kitöltő külön folyamatban fut (spawn), egy-egy AppTest-munkamenettel, amely
+#   a valódi oldalsorrendben kattint végig; az AppTest egy folyamaton belül nem futtatható
+#   párhuzamosan több szálon, ezért nem szálak
+# - a folyamatok közös munkakönyvtárban, ugyanabba a SQLite tárba írnak: ez a több
+#   app-folyamatos üzem (több író, BEGIN IMMEDIATE), nem egyetlen Streamlit-szerver
+# - oldalak között valószerű "gondolkodási idő" (lognormális eloszlás)
+# - a végén: átbocsátás, oldalankénti és beküldési p50/p95/p99 késleltetés,
+#   valamint elveszett / duplikált sorok ellenőrzése a közös válasz-adatbázisban
+# használat:
+#   python loadtest.py --sessions 200 --concurrency 50 --think 3
+#   python loadtest.py --sessions 20 --concurrency 20 --think 0   # csak a szerver terhelése
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from bench import APP_PATH, FORM_KINDS, fill_page, next_button, synthetic_answers
+from survey import PAGES, TOTAL_PAGES
+
+SUBMIT_PAGE = TOTAL_PAGES - 1  # az utolsó kérdésoldal "Tovább" gombja küldi be a kitöltést
+
+
+def percentile(values, p):
+    """Legközelebbi rang szerinti percentilis (p: 0–100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = max(0, math.ceil(p / 100 * len(ordered)) - 1)
+    return ordered[k]
+
+
+class Recorder:
+    """Gyűjtő a fő folyamatban: oldalanként a rerun-idők ms-ban."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = []
+        self.rids = []
+
+    def merge(self, latencies: dict):
+        for name, values in latencies.items():
+            self.latencies[name].extend(values)
+
+    def done(self, rid):
+        self.rids.append(rid)
+
+    def fail(self, msg):
+        self.errors.append(msg)
+
+
+def init_worker(workdir):
+    """Munkafolyamat indítása: a közös munkakönyvtárba lép (ott a közös válasz-tár)."""
+    os.chdir(workdir)
+
+
+def run_session(n, think_s, timeout, seed) -> tuple:
+    """Egy kitöltés egy munkafolyamatban: (rid, {oldal: [ms, ...]}, hiba vagy None).
+
+    A folyamat egyszerre egy munkamenetet futtat; a következőt csak ez után kapja meg.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    latencies = defaultdict(list)
+    rng = random.Random(seed + n)
+    values = synthetic_answers(rng)
+    at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+
+    def step(name):
+        t0 = time.perf_counter()
+        at.run()
+        latencies[name].append((time.perf_counter() - t0) * 1000)
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+
+    def think():
+        if think_s > 0:
+            time.sleep(rng.lognormvariate(math.log(think_s), 0.5))
+
+    try:
+        step("0")
+        for spec in PAGES:
+            think()
+            if spec.items:
+                fill_page(at, spec, values)
+                if spec.kind not in FORM_KINDS:  # űrlapon a válaszok a beküldéssel együtt mennek
+                    step(f"{spec.number}")
+            next_button(at, spec).click()
+            step("submit" if spec.number == SUBMIT_PAGE else f"{spec.number}")
+        if at.session_state["page"] != TOTAL_PAGES:
+            raise RuntimeError(f"a kitöltés a(z) {at.session_state['page']}. oldalon ragadt")
+        # böngészőfrissítés a köszönőoldalon: nem keletkezhet új sor
+        step(f"{TOTAL_PAGES}")
+    except Exception as exc:
+        return None, dict(latencies), f"{n}. kitöltés: {exc!r}"
+    return at.session_state["rid"], dict(latencies), None
+
+
+def check_store(db_path, rids, wait_s):
+    """Elveszett és duplikált sorok: megvárja, amíg az író szál mindent kiír (legfeljebb wait_s)."""
+    expected = set(rids)
+    deadline = time.monotonic() + wait_s
+    while True:
+        conn = sqlite3.connect(db_path)
+        try:
+            stored = [r for (r,) in conn.execute("SELECT rid FROM responses")]
+        except sqlite3.OperationalError:
+            stored = []
+        finally:
+            conn.close()
+        lost = expected - set(stored)
+        if not lost or time.monotonic() > deadline:
+            break
+        time.sleep(0.2)
+    counts = defaultdict(int)
+    for r in stored:
+        counts[r] += 1
+    duplicated = sorted(r for r, c in counts.items() if c > 1)
+    return sorted(lost), duplicated, len(stored)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Egyidejű kitöltők szimulálása (AppTest).")
+    parser.add_argument("--sessions", type=int, default=50, help="kitöltések száma összesen")
+    parser.add_argument("--concurrency", type=int, default=10,
+                        help="egyszerre futó munkamenetek (= munkafolyamatok száma)")
+    parser.add_argument("--think", type=float, default=1.0, help="átlagos gondolkodási idő oldalanként (s)")
+    parser.add_argument("--timeout", type=float, default=60, help="egy rerun időkorlátja (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", help="munkakönyvtár (alap: ideiglenes)")
+    parser.add_argument("--json", help="az eredmény mentése JSON-ként")
+    args = parser.parse_args(argv)
+
+    rec = Recorder()
+    cwd = os.getcwd()
+    tmp = None
+    if args.workdir:
+        os.makedirs(args.workdir, exist_ok=True)
+        workdir = os.path.abspath(args.workdir)  # a munkafolyamatok is ide lépnek
+    else:
+        tmp = tempfile.TemporaryDirectory()
+        workdir = tmp.name
+    os.chdir(workdir)
+    try:
+        t0 = time.perf_counter()
+        # spawn: tiszta folyamatok (nincs örökölt szál / zár), és kilépéskor lefutnak az
+        # atexit kezelők, így az app író szála a sorban maradt sorokat is kiírja
+        pool = ProcessPoolExecutor(max_workers=args.concurrency,
+                                   mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=init_worker, initargs=(workdir,))
+        with pool:
+            futures = [pool.submit(run_session, n, args.think, args.timeout, args.seed)
+                       for n in range(args.sessions)]
+            for f in as_completed(futures):
+                if f.exception():
+                    rec.fail(repr(f.exception()))  # pl. a munkafolyamat összeomlott
+                    continue
+                rid, latencies, error = f.result()
+                rec.merge(latencies)
+                if error:
+                    rec.fail(error)
+                else:
+                    rec.done(rid)
+        wall = time.perf_counter() - t0
+        lost, duplicated, stored = check_store(os.path.join(workdir, "responses.sqlite3"), rec.rids, 10)
+    finally:
+        os.chdir(cwd)
+
+    order = [str(p.number) for p in PAGES if p.number != SUBMIT_PAGE] + ["submit", str(TOTAL_PAGES)]
+    latency = {
+        name: {f"p{p}": round(percentile(rec.latencies[name], p), 1) for p in (50, 95, 99)}
+        | {"n": len(rec.latencies[name])}
+        for name in order if rec.latencies.get(name)
+    }
+    result = {
+        "sessions": args.sessions,
+        "concurrency": args.concurrency,
+        "completed": len(rec.rids),
+        "errors": rec.errors,
+        "wall_s": round(wall, 2),
+        "throughput_per_min": round(len(rec.rids) / wall * 60, 1) if wall else None,
+        "reruns_per_s": round(sum(len(v) for v in rec.latencies.values()) / wall, 1) if wall else None,
+        "latency_ms": latency,
+        "stored_rows": stored,
+        "lost_rids": lost,
+        "duplicated_rids": duplicated,
+    }
+
+    print(f"{result['completed']}/{args.sessions} kitöltés, {args.concurrency} egyidejű, "
+          f"{result['wall_s']} s, {result['throughput_per_min']} kitöltés/perc, "
+          f"{result['reruns_per_s']} rerun/s")
+    print(f"{'oldal':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'n':>6}")
+    for name, row in latency.items():
+        print(f"{name:>8} {row['p50']:>9} {row['p95']:>9} {row['p99']:>9} {row['n']:>6}")
+    print(f"tárolt sorok: {stored}, elveszett: {len(lost)}, duplikált: {len(duplicated)}, "
+          f"hibák: {len(rec.errors)}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2, ensure_ascii=False)
+    if tmp is not None:
+        tmp.cleanup()
+    return 1 if lost or duplicated or rec.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,333 @@
+# metrics.py — beépített mérőszámok a kérdőív-szerver forró útvonalaihoz
+# - számlálók, mérők és késleltetési hisztogramok címkékkel (pl. oldalszám szerint)
+# - egy mérés egy szótárkeresés és néhány összeadás egy zár alatt: elhanyagolható költség
+# - Prometheus szöveges formátumban: időszakosan, atomikusan írt fájl (metrics.prom, pl. a
+#   node_exporter textfile gyűjtőjének) és / vagy egy kis HTTP végpont (/metrics)
+# - több app-folyamatnál mindegyik a saját fájljába ír (metrics.<pid>.prom), és minden sor
+#   process="<pid>" címkét kap: a gyűjtő az összes fájlt beolvassa, összegezni a lekérdezésben
+#   lehet (sum without (process) ...); a kilépett folyamatok fájlja törlődik
+
+import atexit
+import bisect
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+METRICS_PATH = Path("metrics.prom")
+# másodpercben: a rerunok jellemzően 10–500 ms-osak, a mentés sorba állítása µs-os
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+
+def process_path(path=METRICS_PATH, pid=None) -> Path:
+    """Folyamatonkénti fájlnév: metrics.prom -> metrics.<pid>.prom."""
+    path = Path(path)
+    return path.with_name(f"{path.stem}.{pid or os.getpid()}{path.suffix}")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass  # létezik, csak nem a miénk
+    return True
+
+
+def _label_str(key) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in key) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+
+    def header(self) -> list:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help_text):
+        super().__init__(name, help_text)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def render(self, const=()) -> list:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_label_str(const + k)} {v}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Pillanatnyi érték; `fn` megadásával a kiíráskor számolódik (pl. sorhossz, élő munkamenetek)."""
+
+    kind = "gauge"
+
+    def __init__(self, name, help_text, fn=None, kind=None):
+        super().__init__(name, help_text)
+        self.fn = fn
+        if kind:
+            self.kind = kind  # pl. "counter" egy másik objektum számlálójához
+        self._value = 0
+
+    def set(self, value):
+        self._value = value
+
+    def render(self, const=()) -> list:
+        try:
+            value = self.fn() if self.fn else self._value
+        except Exception:
+            return []
+        return self.header() + [f"{self.name}{_label_str(const)} {value}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(buckets)
+        self._series = {}  # címkék -> [vödrönkénti darabszám..., összeg, darab]
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            s = self._series.get(key)
+            if s is None:
+                s = self._series[key] = [0] * (len(self.buckets) + 3)
+            s[i] += 1
+            s[-2] += value
+            s[-1] += 1
+
+    def time(self, **labels):
+        return _Timer(self, labels)
+
+    def render(self, const=()) -> list:
+        with self._lock:
+            items = sorted((k, list(s)) for k, s in self._series.items())
+        lines = self.header()
+        for key, s in items:
+            key = const + key
+            cumulative = 0
+            for bound, n in zip(self.buckets + ("+Inf",), s[:-2]):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_label_str(key + (('le', bound),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_str(key)} {s[-2]:.6f}")
+            lines.append(f"{self.name}_count{_label_str(key)} {s[-1]}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("hist", "labels", "t0")
+
+    def __init__(self, hist, labels):
+        self.hist, self.labels = hist, labels
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.observe(time.perf_counter() - self.t0, **self.labels)
+
+
+class LiveSessions:
+    """Az utóbbi `idle_s` másodpercben aktív munkamenetek (rid -> utolsó futás ideje)."""
+
+    def __init__(self, idle_s: float = 300):
+        self.idle_s = idle_s
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def touch(self, rid):
+        with self._lock:
+            self._seen[rid] = time.monotonic()
+
+    def forget(self, rid):
+        with self._lock:
+            self._seen.pop(rid, None)
+
+    def count(self) -> int:
+        cutoff = time.monotonic() - self.idle_s
+        with self._lock:
+            for rid in [r for r, t in self._seen.items() if t < cutoff]:
+                self._seen.pop(rid, None)
+            return len(self._seen)
+
+
+class Registry:
+    """A mérőszámok gyűjteménye és kiírója (fájl és / vagy HTTP)."""
+
+    def __init__(self, labels: dict = None):
+        self._metrics = {}
+        self._const = tuple(sorted((labels or {}).items()))  # minden sorra (pl. process)
+        self._stop = threading.Event()
+        self._thread = None
+        self._server = None
+
+    def _add(self, metric):
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text) -> Counter:
+        return self._add(Counter(name, help_text))
+
+    def gauge(self, name, help_text, fn=None, kind=None) -> Gauge:
+        return self._add(Gauge(name, help_text, fn, kind))
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help_text, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render(self._const))
+        return "\n".join(lines) + "\n"
+
+    def write(self, path=METRICS_PATH):
+        """Atomikus kiírás: a gyűjtő sosem lát félig írt fájlt."""
+        path = Path(path)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(self.render(), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def start_file_writer(self, path=METRICS_PATH, interval: float = 15):
+        """Időszakos kiírás a `path` fájlba; kilépéskor a fájl törlődik.
+
+        Több folyamat esetén a `path` legyen folyamatonkénti (process_path); indításkor az
+        ugyanígy elnevezett, de már nem futó folyamatok ottmaradt fájljai törlődnek.
+        """
+        path = Path(path)
+        base, _, suffix = path.name.rpartition(".")
+        stem = base.rpartition(".")[0]
+        for old in path.parent.glob(f"{stem}.*.{suffix}"):
+            pid = old.name[len(stem) + 1:-len(suffix) - 1]
+            if pid.isdigit() and int(pid) != os.getpid() and not _pid_alive(int(pid)):
+                old.unlink(missing_ok=True)
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.write(path)
+                except OSError:
+                    log.warning("A mérőszámfájl írása sikertelen", exc_info=True)
+
+        self._thread = threading.Thread(target=run, name="metrics-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close, path)
+
+    def start_http(self, port: int, host: str = "127.0.0.1"):
+        """GET /metrics egy külön szálon (csak helyi gyűjtőnek, alapból localhost)."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+
+    def close(self, path=None):
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+        if path is not None:
+            # a kilépett folyamat sorai ne maradjanak a gyűjtőben (a számláló nullázódása a
+            # rate()-nek nem gond, egy befagyott érték viszont félrevezető)
+            Path(path).unlink(missing_ok=True)
+
+
+class SurveyMetrics:
+    """A kérdőív-szerver mérőszámai egy helyen (a Streamlit-folyamatban egy példány)."""
+
+    def __init__(self, registry=None, live_idle_s: float = 300):
+        self.registry = r = registry or Registry({"process": str(os.getpid())})
+        self.live = LiveSessions(live_idle_s)
+        self.rerun = r.histogram("survey_rerun_seconds", "Szkriptfutás ideje oldalanként (s)")
+        self.save_row = r.histogram("survey_save_row_seconds", "save_row ideje (csak sorba állítás, s)")
+        self.nav_rejections = r.counter("survey_nav_rejections_total",
+                                        "Elutasított továbblépések oldal és ok szerint")
+        self.submits = r.counter("survey_submits_total", "Beküldött kitöltések")
+        self.submits.inc(0)  # címke nélküli számláló: 0-val is látszódjon
+        r.gauge("survey_live_sessions", "Az utóbbi percekben aktív munkamenetek", self.live.count)
+
+    def watch_writer(self, writer):
+        """Az író szál mérőszámai; a tényleges tárírás (append_many) idejét is méri."""
+        commit = self.registry.histogram("survey_store_commit_seconds",
+                                         "Egy írási csomag commitja a tárba (append_many, s)")
+        failures = self.registry.counter("survey_store_commit_failures_total",
+                                         "Sikertelen commit-próbálkozások (újrapróbálás előtt)")
+        failures.inc(0)
+
+        def on_commit(seconds, ok):
+            commit.observe(seconds, ok="true" if ok else "false")
+            if not ok:
+                failures.inc()
+
+        writer.on_commit = on_commit
+        self.registry.gauge("survey_write_queue", "Mentésre váró sorok", lambda: writer.backlog)
+        self.registry.gauge("survey_duplicates_total", "Elnyelt ismételt beküldések",
+                            lambda: writer.duplicates, kind="counter")
+        self.registry.gauge("survey_save_failed_total",
+                            "A tárba nem írható, a tartalék naplóba került sorok",
+                            lambda: writer.failed, kind="counter")
+
+    def watch_notifier(self, notifier):
+        for attr, help_text in (("sent", "Elküldött értesítő levelek"),
+                                ("failures", "Sikertelen levélküldések (minden próbálkozás után)"),
+                                ("dropped", "Teli sor miatt eldobott értesítések")):
+            self.registry.gauge(f"survey_email_{attr}_total", help_text,
+                                lambda a=attr: getattr(notifier, a), kind="counter")
+
+    def watch_admission(self, controller):
+        r = self.registry
+        r.gauge("survey_admission_active", "Aktív (befogadott) munkamenetek",
+                lambda: controller.stats()["active"])
+        r.gauge("survey_admission_waiting", "Várakozó új érkezők (sorhossz)",
+                lambda: controller.stats()["waiting"])
+        r.gauge("survey_admission_shed_total", "Kiszolgált várakozó oldalak",
+                lambda: controller.shed, kind="counter")
+        r.gauge("survey_admission_admitted_total", "Beengedett új kitöltések",
+                lambda: controller.admitted, kind="counter")
+
+    def watch_assets(self, cache):
+        r = self.registry
+        for key, kind, help_text in (("hits", "counter", "Képi/szöveges gyorsítótár-találatok"),
+                                     ("misses", "counter", "Gyorsítótár-hiányok (betöltés)"),
+                                     ("evictions", "counter", "Kiszorított elemek"),
+                                     ("items", "gauge", "Elemek a gyorsítótárban"),
+                                     ("bytes", "gauge", "A gyorsítótár mérete (bájt)")):
+            r.gauge(f"survey_asset_cache_{key}" + ("_total" if kind == "counter" else ""), help_text,
+                    lambda k=key: cache.stats()[k], kind=kind)
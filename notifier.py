@@ -0,0 +1,143 @@
+# notifier.py — e-mail értesítések háttérszálon
+# - egy tartós, szükség esetén újracsatlakozó SMTP-kapcsolat (nem kitöltésenként új)
+# - korlátozott számú újrapróbálkozás, a hiba soha nem akasztja meg a mentést
+# - opcionális összesítő mód: "N új kitöltés az elmúlt 10 percben"
+# - az smtplib / email csak az első küldéskor töltődik be (a háttérszálon, nem a kitöltő futásában)
+
+import atexit
+import logging
+import queue
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class EmailNotifier:
+    """Háttérben futó értesítő; a `notify` sosem blokkol és sosem dob kivételt.
+
+    `digest_seconds=0` esetén minden kitöltésről külön levél megy, különben az
+    adott időablakban érkezett kitöltésekről egyetlen összesítő levél.
+    A `host`/`port`/`starttls` paraméterekkel helyi SMTP-tesztszerverre is irányítható.
+    """
+
+    def __init__(self, sender, password=None, receiver=None, host="smtp.gmail.com",
+                 port=587, starttls=True, digest_seconds=0, max_retries=3,
+                 timeout=10, queue_size=1000):
+        self.sender = sender
+        self.password = password
+        self.receiver = receiver or sender
+        self.host = host
+        self.port = port
+        self.starttls = starttls
+        self.digest_seconds = digest_seconds
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.sent = 0
+        self.failures = 0
+        self.dropped = 0
+        self._smtp = None
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="email-notifier", daemon=True)
+        self._thread.start()
+        atexit.register(self.close, 5)
+
+    def notify(self, record: dict):
+        """Kitöltés beállítása az értesítési sorba; ha a sor tele van, eldobja."""
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=None):
+        """Leállítás: a függő összesítő még kimegy, majd a kapcsolat bezárul."""
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    # ---------- háttérszál ----------
+    def _run(self):
+        pending = []
+        window_start = time.monotonic()
+        while True:
+            wait = None
+            if self.digest_seconds and pending:
+                wait = max(0.0, window_start + self.digest_seconds - time.monotonic())
+            try:
+                item = self._queue.get(timeout=wait)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                if pending:
+                    self._send_digest(pending)
+                self._disconnect()
+                return
+            if item is not None:
+                if not self.digest_seconds:
+                    self._send(*self._single_message(item))
+                    continue
+                if not pending:
+                    window_start = time.monotonic()
+                pending.append(item)
+            if pending and time.monotonic() >= window_start + self.digest_seconds:
+                self._send_digest(pending)
+                pending = []
+
+    def _single_message(self, record):
+        subject = "Új kérdőív kitöltés érkezett"
+        body = f"Egy új válasz érkezett:\n\n{record}"
+        return subject, body
+
+    def _send_digest(self, records):
+        minutes = max(1, round(self.digest_seconds / 60))
+        subject = f"{len(records)} új kérdőív kitöltés az elmúlt {minutes} percben"
+        lines = [f"- {r.get('submitted_at', '')}  {r.get('group', '')}  {r.get('rid', '')}"
+                 for r in records]
+        body = subject + ":\n\n" + "\n".join(lines)
+        self._send(subject, body)
+
+    def _send(self, subject, body):
+        from email.mime.text import MIMEText
+
+        msg = MIMEText(body)
+        msg["Subject"] = subject
+        msg["From"] = self.sender
+        msg["To"] = self.receiver
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                self._connection().send_message(msg)
+                self.sent += 1
+                return
+            except Exception:
+                log.warning("Email küldési hiba (%d/%d. próbálkozás)", attempt,
+                            self.max_retries, exc_info=True)
+                # a kapcsolatot eldobjuk, a következő próbálkozás újracsatlakozik
+                self._disconnect()
+                if attempt < self.max_retries:
+                    time.sleep(min(2 ** (attempt - 1) - 1, 30))
+        self.failures += 1
+
+    def _connection(self):
+        if self._smtp is None:
+            import smtplib
+
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                smtp.starttls()
+            if self.password:
+                smtp.login(self.sender, self.password)
+            self._smtp = smtp
+        return self._smtp
+
+    def _disconnect(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
@@ -0,0 +1,151 @@
+# profiling.py — kérésre bekapcsolható profilozás egy-egy szkriptfutásra (rerun)
+# - nem az egész szerver: csak a kijelölt munkamenet (?profile=<[profiling] key>, külön titok,
+#   nem az admin jelszó) vagy a [profiling] beállításban megadott oldalak futásai, mintavételezve
+# - futásonként egy cProfile (.prof) és egy leíró (.json: oldal, csoport, rid, idő,
+#   memóriacsúcs és a legtöbbet foglaló sorok tracemalloc szerint)
+# - a profiles/ mappában legfeljebb MAX_SNAPSHOTS futás marad meg (a legrégebbiek törlődnek)
+# - egyszerre egy profil futhat: a cProfile és a tracemalloc folyamatszintű; a többi
+#   munkamenet futása ilyenkor kimarad (3.12+ alatt a párhuzamos szálak is belekerülhetnek)
+# használat (összesített nézet a legforróbb függvényekről):
+#   python profiling.py [--dir profiles] [--page 3] [--group visual] [--sort tottime] [--top 25]
+
+import argparse
+import cProfile
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+PROFILE_DIR = Path("profiles")
+MAX_SNAPSHOTS = 50
+STALE_S = 60  # ennyi idő után egy le nem zárt profil (kivétel a futásban) felszabadul
+
+_lock = threading.Lock()
+_active = None
+
+
+class RerunProfiler:
+    """Egy szkriptfutás profilja; start() és stop() között mér."""
+
+    def __init__(self, page, group, rid, directory=PROFILE_DIR, trace_memory=True):
+        self.tags = {"page": page, "group": group, "rid": rid}
+        self.directory = Path(directory)
+        self.trace_memory = trace_memory
+        self._profile = cProfile.Profile()
+        self._own_trace = False
+        self._t0 = 0.0
+
+    @classmethod
+    def start(cls, page, group, rid, **kwargs):
+        """Új profil indítása; None, ha éppen egy másik munkamenet profilja fut."""
+        global _active
+        with _lock:
+            if _active is not None:
+                if time.monotonic() - _active._t0 < STALE_S:
+                    return None
+                _active._disable()  # egy korábbi futás kivétellel ért véget
+            prof = cls(page, group, rid, **kwargs)
+            try:
+                prof._enable()
+            except ValueError:
+                return None  # egy külső profiler már fut a folyamatban
+            _active = prof
+            return prof
+
+    def _enable(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._own_trace = True
+        self._t0 = time.monotonic()
+        self._profile.enable()
+
+    def _disable(self):
+        self._profile.disable()
+        if self._own_trace:
+            tracemalloc.stop()
+            self._own_trace = False
+
+    def stop(self, page=None) -> Path:
+        """Mérés vége, a snapshot kiírása; visszaadja a .prof fájl útvonalát."""
+        global _active
+        self._profile.disable()
+        wall = time.monotonic() - self._t0
+        meta = dict(self.tags, page_end=page, wall_s=round(wall, 4), ts=time.time())
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            meta["mem_peak_kb"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+            meta["top_alloc"] = [
+                {"where": str(s.traceback), "kb": round(s.size / 1024, 1), "count": s.count}
+                for s in snapshot.statistics("lineno")[:15]
+            ]
+        if self._own_trace:
+            tracemalloc.stop()
+            self._own_trace = False
+        with _lock:
+            if _active is self:
+                _active = None
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        rid = str(self.tags["rid"] or "")[:8]
+        # ezredmásodperces időbélyeggel kezdődik: a név szerinti rendezés időrend is
+        stem = f"{int(time.time() * 1000)}_p{self.tags['page']}_{self.tags['group']}_{rid}"
+        prof_path = self.directory / f"{stem}.prof"
+        self._profile.dump_stats(prof_path)
+        (self.directory / f"{stem}.json").write_text(
+            json.dumps(meta, ensure_ascii=False, indent=1), encoding="utf-8")
+        rotate(self.directory)
+        return prof_path
+
+
+def rotate(directory=PROFILE_DIR, keep=MAX_SNAPSHOTS):
+    """Csak a legutóbbi `keep` snapshot marad meg (a fájlnév időbélyeggel kezdődik)."""
+    snapshots = sorted(Path(directory).glob("*.prof"))
+    for old in snapshots[:-keep] if keep else snapshots:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".json").unlink(missing_ok=True)
+
+
+def load_snapshots(directory=PROFILE_DIR, page=None, group=None) -> list:
+    """(prof útvonal, leíró) párok, szűrve oldalra / csoportra."""
+    out = []
+    for prof in sorted(Path(directory).glob("*.prof")):
+        try:
+            meta = json.loads(prof.with_suffix(".json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            meta = {}
+        if page is not None and meta.get("page") != page:
+            continue
+        if group is not None and meta.get("group") != group:
+            continue
+        out.append((prof, meta))
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="A mentett rerun-profilok összesítése.")
+    parser.add_argument("--dir", default=str(PROFILE_DIR), help="a profilok mappája")
+    parser.add_argument("--page", type=int, help="csak ennek az oldalnak a futásai")
+    parser.add_argument("--group", help="csak ennek a csoportnak a futásai (text / visual)")
+    parser.add_argument("--sort", default="cumulative", choices=("cumulative", "tottime", "ncalls"))
+    parser.add_argument("--top", type=int, default=25, help="ennyi függvény jelenjen meg")
+    args = parser.parse_args(argv)
+
+    snaps = load_snapshots(args.dir, args.page, args.group)
+    if not snaps:
+        print("Nincs megfelelő profil.")
+        return
+    print(f"{'fájl':<48} {'oldal':>5} {'csoport':>8} {'idő (ms)':>9} {'mem (KB)':>9}")
+    for prof, meta in snaps:
+        print(f"{prof.name:<48} {meta.get('page', '?')!s:>5} {meta.get('group', '?')!s:>8} "
+              f"{meta.get('wall_s', 0) * 1000:>9.1f} {meta.get('mem_peak_kb', '-')!s:>9}")
+    print()
+    stats = pstats.Stats(str(snaps[0][0]))
+    for prof, _ in snaps[1:]:
+        stats.add(str(prof))
+    stats.strip_dirs().sort_stats(args.sort).print_stats(args.top)
+
+
+if __name__ == "__main__":
+    main()
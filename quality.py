@@ -0,0 +1,169 @@
+# quality.py — adatminőségi szűrés elemzés előtt (NumPy, vektorizált)
+# - ATTN:  a figyelmi próbára nem a "Harmadik" a válasz
+# - SPEED: a kérdésoldalak legalább SPEED_SHARE részén a kitöltő gyorsabb volt, mint az
+#          oldal medián idejének SPEED_RATIO-szorosa
+# - FLAT:  egy 1–10 skálás blokkban minden válasz azonos (nulla szórás)
+# - RUN:   az összes 1–10 skálás kérdés sorrendjében legalább RUN_LENGTH azonos válasz egymás után
+# - minőségi pontszám: 1 − a jelzések súlyainak összege (0 alá nem megy); 1 = tiszta
+# - teljes adatsoron (flag_table) vagy növekményesen, csak az új sorokon (QualityMonitor)
+# használat:  python quality.py [--db responses.sqlite3] [--out quality.csv]
+
+import argparse
+from collections import defaultdict
+
+import numpy as np
+
+from storage import DB_PATH, ResponseStore, SeqCursor, open_store
+from survey import ITEMS, LIKERT, PAGES
+
+ATTENTION_ITEM = "attention_check"
+ATTENTION_ANSWER = "Harmadik"
+SPEED_RATIO = 0.3
+SPEED_SHARE = 0.5
+RUN_LENGTH = 10
+MIN_FLAT_ITEMS = 3
+WEIGHTS = {"ATTN": 0.5, "SPEED": 0.3, "FLAT": 0.1, "RUN": 0.3}
+
+# az 1–10 skálás rádiógombos tételek kitöltési sorrendben, blokkonként is
+RADIO_ITEMS = tuple(it.id for it in ITEMS if it.widget == "radio" and it.options == LIKERT)
+RADIO_BLOCKS = defaultdict(list)
+for _it in ITEMS:
+    if _it.id in RADIO_ITEMS and _it.group:
+        RADIO_BLOCKS[_it.group].append(_it.id)
+RADIO_BLOCKS = {g: ids for g, ids in RADIO_BLOCKS.items() if len(ids) >= MIN_FLAT_ITEMS}
+# csak a kérdésoldalak ideje számít (az ajánlat- és tájékoztató oldalakat lehet gyorsan olvasni)
+TIMED_PAGES = tuple(p.number for p in PAGES if p.kind == "questions")
+DURATION_COLS = tuple(f"duration_page_{p}" for p in TIMED_PAGES)
+COLUMNS = ("rid", ATTENTION_ITEM) + RADIO_ITEMS + DURATION_COLS
+
+
+def _matrix(table, cols) -> np.ndarray:
+    return np.column_stack([np.asarray(table[c], dtype=np.float64) for c in cols])
+
+
+def page_medians(durations: np.ndarray) -> np.ndarray:
+    """Oldalankénti medián idő; a 0 (az oldalt nem látta / nem mért) nem számít bele."""
+    d = np.where(durations > 0, durations, np.nan)
+    if not len(d):
+        return np.full(d.shape[1], np.nan)
+    with np.errstate(all="ignore"):
+        return np.nanmedian(d, axis=0)
+
+
+def longest_run(x: np.ndarray) -> np.ndarray:
+    """Soronként a leghosszabb azonos (nem hiányzó) válaszsorozat hossza."""
+    n, k = x.shape
+    if not k:
+        return np.zeros(n, dtype=int)
+    best = np.where(np.isnan(x[:, 0]), 0, 1)
+    cur = best.copy()
+    for j in range(1, k):
+        same = x[:, j] == x[:, j - 1]   # a NaN sosem egyenlő: megszakítja a sorozatot
+        cur = np.where(same, cur + 1, np.where(np.isnan(x[:, j]), 0, 1))
+        np.maximum(best, cur, out=best)
+    return best
+
+
+def flag_table(table, medians: np.ndarray = None) -> dict:
+    """Jelzések a teljes táblára: {"rid", "score", "reasons", "flags": {kód: bool tömb}}.
+
+    A medians megadásával (pl. növekményes futásnál) nem a tábla saját mediánjai számítanak.
+    """
+    rid = np.asarray(table["rid"], dtype=object)
+    n = len(rid)
+    flags = {}
+
+    attn = np.asarray(table[ATTENTION_ITEM], dtype=object)
+    flags["ATTN"] = attn != ATTENTION_ANSWER
+
+    durations = _matrix(table, DURATION_COLS)
+    if medians is None:
+        medians = page_medians(durations)
+    with np.errstate(invalid="ignore"):
+        fast = (durations > 0) & (durations < SPEED_RATIO * medians)
+    measured = ~np.isnan(medians)
+    flags["SPEED"] = fast.sum(axis=1) >= SPEED_SHARE * max(int(measured.sum()), 1)
+
+    radio = _matrix(table, RADIO_ITEMS)
+    pos = {c: i for i, c in enumerate(RADIO_ITEMS)}
+    flat_blocks = []
+    for group, ids in RADIO_BLOCKS.items():
+        block = radio[:, [pos[i] for i in ids]]
+        complete = ~np.isnan(block).any(axis=1)
+        flat_blocks.append(complete & (block.max(axis=1, initial=-1) == block.min(axis=1, initial=99)))
+    flags["FLAT"] = np.any(flat_blocks, axis=0) if flat_blocks else np.zeros(n, dtype=bool)
+    flags["RUN"] = longest_run(radio) >= RUN_LENGTH
+
+    penalty = sum(WEIGHTS[code] * f for code, f in flags.items())
+    score = np.clip(1.0 - penalty, 0.0, 1.0)
+    reasons = [";".join(code for code in flags if flags[code][i]) for i in range(n)]
+    return {"rid": rid, "score": score, "reasons": reasons, "flags": flags, "medians": medians}
+
+
+class QualityMonitor:
+    """Növekményes minőségellenőrzés a válasz-tár fölött (az admin összesítőhöz hasonlóan).
+
+    Az ATTN / FLAT / RUN soronként független, így pontos; a SPEED az addigi összes sor
+    oldalmediánjához mér (a korai kitöltők a teljes futásnál kaphatnak más jelzést).
+    """
+
+    def __init__(self):
+        self.cursor = SeqCursor()
+        self.durations = np.empty((0, len(DURATION_COLS)))
+        self.results = {}  # rid -> (pontszám, okok)
+
+    def update(self, store) -> int:
+        table = {c: [] for c in COLUMNS}
+        for _, row in self.cursor.read(store):
+            for c in COLUMNS:
+                table[c].append(row.get(c))
+        n = len(table["rid"])
+        if not n:
+            return 0
+        self.durations = np.vstack([self.durations, _matrix(table, DURATION_COLS)])
+        out = flag_table(table, medians=page_medians(self.durations))
+        for rid, score, reasons in zip(out["rid"], out["score"], out["reasons"]):
+            self.results[rid] = (float(score), reasons)
+        return n
+
+    def flagged(self, max_score: float = 1.0) -> dict:
+        return {rid: r for rid, r in self.results.items() if r[0] < max_score}
+
+
+def load_table(store: ResponseStore) -> dict:
+    data = {c: [] for c in COLUMNS}
+    for _, row in store.iter_rows():
+        for c in COLUMNS:
+            data[c].append(row.get(c))
+    return data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Adatminőségi jelzések kitöltőnként.")
+    parser.add_argument("--db", default=str(DB_PATH),
+                        help="a válasz-tár útvonala vagy URL-je (lásd storage.open_store)")
+    parser.add_argument("--out", help="eredmény CSV fájlba (rid, score, reasons)")
+    args = parser.parse_args(argv)
+
+    store = open_store(args.db)
+    out = flag_table(load_table(store))
+    store.close()
+
+    n = len(out["rid"])
+    print(f"kitöltők: {n}")
+    for code, f in out["flags"].items():
+        print(f"  {code:<6} {int(f.sum()):>7}")
+    print(f"  tiszta {int((out['score'] == 1).sum()):>7}")
+
+    if args.out:
+        import csv
+        with open(args.out, "w", newline="", encoding="utf-8") as fh:
+            w = csv.writer(fh)
+            w.writerow(["rid", "score", "reasons"])
+            for row in zip(out["rid"], out["score"].round(2), out["reasons"]):
+                w.writerow(row)
+        print(f"{n} sor -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
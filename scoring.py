@@ -0,0 +1,150 @@
+# scoring.py — skálapontszámok és megbízhatóság a teljes választáblán (NumPy, vektorizált)
+# - a többtételes 1–10 skálák kompozit pontszáma: a megválaszolt tételek átlaga,
+#   a "(fordított tétel)" jelölésű tételek megfordítva (11 − x)
+# - hiányzó adat: a pontszám csak akkor számolódik, ha a tételek legalább MIN_RATIO része
+#   megvan; különben NaN
+# - skálánként Cronbach-alfa és korrigált tétel–totál korrelációk (teljes eseteken)
+# - egy skála egyetlen (n × k) mátrixművelet, így 10^6 kitöltő is belefér pár másodpercbe
+# használat:
+#   python scoring.py [--db responses.sqlite3] [--out scores.csv]
+#   python scoring.py --parquet responses.parquet
+
+import argparse
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from storage import DB_PATH, ResponseStore, open_store
+from survey import ITEMS, LIKERT
+
+REVERSE_MARK = "(fordított tétel)"
+MIN_RATIO = 0.75
+# a kérdőívben ténylegesen megjelenő skálák (survey.Item.group szerint)
+SCALE_GROUPS = ("experience", "confirmation", "confirmation_seeking", "responsibility",
+                "maximization", "aias")
+
+
+@dataclass(frozen=True)
+class Scale:
+    name: str
+    items: tuple      # tétel-azonosítók (oszlopnevek)
+    reverse: tuple    # bool tételenként
+    low: int = LIKERT[0]
+    high: int = LIKERT[-1]
+
+    @property
+    def min_items(self) -> int:
+        return math.ceil(len(self.items) * MIN_RATIO)
+
+
+def build_scales(groups=SCALE_GROUPS) -> tuple:
+    scales = []
+    for group in groups:
+        items = [it for it in ITEMS if it.group == group]
+        if not items or any(it.options != LIKERT for it in items):
+            raise ValueError(f"{group}: nem 1–10 skálás tételblokk")
+        scales.append(Scale(group, tuple(it.id for it in items),
+                            tuple(REVERSE_MARK in it.label for it in items)))
+    return tuple(scales)
+
+
+SCALES = build_scales()
+
+
+def item_matrix(table, scale: Scale) -> np.ndarray:
+    """(n × k) float mátrix a skála tételeiből, fordított tételek megfordítva, hiány = NaN.
+
+    A table bármi, ami oszlopnév szerint indexelhető (dict of arrays, pandas.DataFrame).
+    """
+    x = np.column_stack([np.asarray(table[i], dtype=np.float64) for i in scale.items])  # None -> nan
+    rev = np.asarray(scale.reverse)
+    if rev.any():
+        x[:, rev] = (scale.low + scale.high) - x[:, rev]
+    return x
+
+
+def composite(x: np.ndarray, min_items: int) -> np.ndarray:
+    """Soronkénti átlag a megválaszolt tételekből; kevés válasz esetén NaN."""
+    answered = ~np.isnan(x)
+    n = answered.sum(axis=1)
+    total = np.where(answered, x, 0.0).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        score = total / n
+    score[n < min_items] = np.nan
+    return score
+
+
+def reliability(x: np.ndarray) -> dict:
+    """Cronbach-alfa és korrigált tétel–totál korreláció a hiánytalan sorokon."""
+    complete = x[~np.isnan(x).any(axis=1)]
+    n, k = complete.shape
+    if n < 2 or k < 2:
+        return {"n": int(n), "alpha": float("nan"), "item_total": [float("nan")] * k}
+    item_var = complete.var(axis=0, ddof=1)
+    total = complete.sum(axis=1)
+    total_var = total.var(ddof=1)
+    alpha = k / (k - 1) * (1 - item_var.sum() / total_var) if total_var > 0 else float("nan")
+
+    # korrigált: minden tétel a többi tétel összegével (saját maga nélkül)
+    rest = total[:, None] - complete
+    xc = complete - complete.mean(axis=0)
+    rc = rest - rest.mean(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r = (xc * rc).sum(axis=0) / np.sqrt((xc ** 2).sum(axis=0) * (rc ** 2).sum(axis=0))
+    return {"n": int(n), "alpha": float(alpha), "item_total": [float(v) for v in r]}
+
+
+def score_table(table, scales=SCALES) -> tuple:
+    """Minden skála egy menetben: ({skála: pontszám-tömb}, {skála: megbízhatóság})."""
+    scores, stats = {}, {}
+    for scale in scales:
+        x = item_matrix(table, scale)
+        scores[scale.name] = composite(x, scale.min_items)
+        rel = reliability(x)
+        rel["item_total"] = dict(zip(scale.items, rel["item_total"]))
+        stats[scale.name] = rel
+    return scores, stats
+
+
+def load_table(store: ResponseStore, columns) -> dict:
+    """A tárolt válaszokból csak a kért oszlopok, oszloponként egy-egy tömbként."""
+    data = {c: [] for c in columns}
+    for _, row in store.iter_rows():
+        for c in columns:
+            data[c].append(row.get(c))
+    return {c: np.array(v, dtype=object if c == "rid" else np.float64) for c, v in data.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Skálapontszámok és Cronbach-alfa.")
+    parser.add_argument("--db", default=str(DB_PATH),
+                        help="a válasz-tár útvonala vagy URL-je (lásd storage.open_store)")
+    parser.add_argument("--parquet", help="az export.py Parquet kimenete (az adatbázis helyett)")
+    parser.add_argument("--out", help="a pontszámok CSV fájlba (rid + skálák)")
+    args = parser.parse_args(argv)
+
+    columns = ["rid"] + [i for s in SCALES for i in s.items]
+    if args.parquet:
+        import pandas as pd
+        table = pd.read_parquet(args.parquet, columns=columns)
+    else:
+        store = open_store(args.db)
+        table = load_table(store, columns)
+        store.close()
+
+    scores, stats = score_table(table)
+    print(f"{'skála':<22} {'n':>7} {'alfa':>6}  tétel–totál r")
+    for name, rel in stats.items():
+        rs = " ".join(f"{k}={v:.2f}" for k, v in rel["item_total"].items())
+        print(f"{name:<22} {rel['n']:>7} {rel['alpha']:>6.3f}  {rs}")
+
+    if args.out:
+        import pandas as pd
+        out = pd.DataFrame({"rid": np.asarray(table["rid"]), **scores})
+        out.to_csv(args.out, index=False)
+        print(f"{len(out)} sor -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,595 @@
+# storage.py — a kitöltések tartós, csak hozzáfűző tárolása
+# - SQLite adatbázis WAL módban: egy beküldés = egy INSERT, nincs teljes újraírás
+# - a responses.xlsx csak exportáláskor készül (lásd export.py); a korábbi, élő responses.xlsx
+#   sorai a tár első megnyitásakor egyszer átkerülnek (import_legacy_xlsx)
+# - egyetlen író szál: a párhuzamos beküldések sorba állnak, és csoportosan íródnak ki
+# - rid szerint idempotens: ugyanaz a kitöltés legfeljebb egyszer kerül be
+# - cserélhető háttértár (open_store): SQLite (alap), régi XLSX fájl, vagy kliens–szerver
+#   PostgreSQL – több app-folyamat is írhat ugyanabba az adatkészletbe
+#
+# Egy háttértár felülete (ezt használja a ResponseWriter, az admin nézet és az eszközök):
+#   has_rid(rid) -> bool            a folyamat által ismert, már mentett rid-e
+#   append_many(rows) -> int        egy tranzakció; a már mentett rid-ek kimaradnak
+#   count() -> int
+#   iter_rows(after_seq=0)          (seq, sor) párok seq szerint (növekményesen: SeqCursor)
+#   close()
+#   duplicates                      elnyelt ismételt beküldések száma
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+DB_PATH = Path("responses.sqlite3")
+LEGACY_XLSX_PATH = Path("responses.xlsx")  # a régi app ide írt minden beküldést
+# a tárba többszöri próbálkozás után sem írható sorok tartós helye; indításkor visszajátszódik
+FALLBACK_PATH = Path("responses.failed.jsonl")
+
+# fontos oszlopok sorrendje (exportnál)
+ID_COLS = ["rid", "entered_at", "submitted_at", "group"]
+TIME_COLS = [f"duration_page_{i}" for i in range(1, 20)]
+
+
+def flatten_row(row: dict) -> dict:
+    """Lapos sor: a dict-értékek külön oszlopokba, a listák JSON-szövegként."""
+    flat = {}
+    for k, v in row.items():
+        if isinstance(v, dict):
+            for subk, subv in v.items():
+                flat[f"{k}_{subk}"] = subv
+        elif isinstance(v, list):
+            flat[k] = json.dumps(v, ensure_ascii=False)
+        else:
+            flat[k] = v
+    return flat
+
+
+def order_columns(columns) -> list:
+    """Az exportált oszlopok sorrendje: azonosítók, oldalidők, majd a többi."""
+    other_cols = [c for c in columns if c not in ID_COLS + TIME_COLS]
+    return ID_COLS + TIME_COLS + other_cols
+
+
+class ResponseStore:
+    """Csak hozzáfűző válasz-tár SQLite-ban (WAL napló, szálbiztos)."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " rid TEXT,"
+            " submitted_at TEXT,"
+            " payload TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS responses_rid ON responses (rid)")
+        # a már mentett rid-ek indexe: egyszer töltjük be, utána minden ellenőrzés O(1)
+        self._rids = {rid for (rid,) in self._conn.execute(
+            "SELECT rid FROM responses WHERE rid IS NOT NULL")}
+        self.duplicates = 0  # elnyelt ismételt beküldések száma
+
+    def has_rid(self, rid) -> bool:
+        return rid in self._rids
+
+    def append(self, row: dict) -> int:
+        """Egy sor hozzáfűzése – O(1), a meglévő adatokat nem olvassa újra."""
+        return self.append_many([row])
+
+    def append_many(self, rows) -> int:
+        """Több sor hozzáfűzése egyetlen tranzakcióban (egy fsync a teljes csomagra).
+
+        A már mentett rid-ű sorokat kihagyja; visszaadja a ténylegesen beírt sorok számát.
+        """
+        params = []
+        for row in rows:
+            flat = flatten_row(row)
+            payload = json.dumps(flat, ensure_ascii=False, default=str)
+            params.append((flat.get("rid"), flat.get("submitted_at"), payload))
+        with self._lock:
+            fresh, batch_rids = [], set()
+            for p in params:
+                if p[0] is not None and (p[0] in self._rids or p[0] in batch_rids):
+                    self.duplicates += 1
+                    continue
+                batch_rids.add(p[0])
+                fresh.append(p)
+            if not fresh:
+                return 0
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cur = self._conn.executemany(
+                    "INSERT OR IGNORE INTO responses (rid, submitted_at, payload) VALUES (?, ?, ?)",
+                    fresh,
+                )
+                inserted = cur.rowcount
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            # amit egy másik folyamat közben már beírt, azt az OR IGNORE nyelte el
+            self.duplicates += len(fresh) - inserted
+            self._rids.update(batch_rids)
+            self._rids.discard(None)
+            return inserted
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def iter_rows(self, after_seq: int = 0):
+        """A sorok beküldési sorrendben (seq, sor) párokként, folyamatosan olvasva."""
+        # külön kapcsolat: az export ne tartsa a lock-ot, WAL mellett az írók futhatnak
+        conn = sqlite3.connect(self.path)
+        try:
+            cur = conn.execute(
+                "SELECT seq, payload FROM responses WHERE seq > ? ORDER BY seq", (after_seq,)
+            )
+            for seq, payload in cur:
+                yield seq, json.loads(payload)
+        finally:
+            conn.close()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class XlsxStore:
+    """A régi tárolás: egyetlen responses.xlsx, minden beküldéskor teljes újraírással.
+
+    Csak kis mintához / visszafelé kompatibilitáshoz. A fájlt egy mellette lévő .lock fájl
+    folyamatok közötti zárja védi, és atomikusan (ideiglenes fájl + csere) íródik felül,
+    így több folyamat sem ír egymásra, és félbeszakadt mentés sem rontja el.
+    """
+
+    SHEET = "valaszok"
+
+    def __init__(self, path="responses.xlsx"):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._rids = {row.get("rid") for _, row in self.iter_rows()}
+        self._rids.discard(None)
+        self.duplicates = 0
+
+    def has_rid(self, rid) -> bool:
+        return rid in self._rids
+
+    def append(self, row: dict) -> int:
+        return self.append_many([row])
+
+    def append_many(self, rows) -> int:
+        from openpyxl import Workbook
+
+        with self._lock, _file_lock(self.path.with_suffix(".lock")):
+            # a zár alatt újraolvasva: egy másik folyamat közben írhatott
+            existing = [row for _, row in self.iter_rows()]
+            self._rids.update(row.get("rid") for row in existing)
+            fresh = []
+            for row in rows:
+                flat = flatten_row(row)
+                rid = flat.get("rid")
+                if rid is not None and rid in self._rids:
+                    self.duplicates += 1
+                    continue
+                self._rids.add(rid)
+                fresh.append(flat)
+            self._rids.discard(None)
+            if not fresh:
+                return 0
+            all_rows = existing + fresh
+            header = order_columns(list(dict.fromkeys(c for row in all_rows for c in row)))
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet(self.SHEET)
+            ws.append(header)
+            for row in all_rows:
+                ws.append([row.get(c) for c in header])
+            fd, tmp = tempfile.mkstemp(suffix=".xlsx", dir=self.path.parent)
+            os.close(fd)
+            wb.save(tmp)
+            os.replace(tmp, self.path)
+            return len(fresh)
+
+    def count(self) -> int:
+        return sum(1 for _ in self.iter_rows())
+
+    def iter_rows(self, after_seq: int = 0):
+        return _read_xlsx(self.path, after_seq)
+
+    def close(self):
+        pass
+
+
+def _read_xlsx(path, after_seq: int = 0):
+    """Egy XLSX munkalap sorai (seq = sorszám a fejléc után, 1-től) dict-ként."""
+    path = Path(path)
+    if not path.exists():
+        return
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None) or ()
+        for seq, values in enumerate(rows, start=1):
+            if seq > after_seq:
+                yield seq, {k: v for k, v in zip(header, values) if k is not None}
+    finally:
+        wb.close()
+
+
+class PostgresStore:
+    """Kliens–szerver tár PostgreSQL-ben (psycopg 3, opcionális függőség).
+
+    Ugyanaz a séma, mint SQLite-ban (seq, rid egyedi, payload JSONB); a párhuzamos
+    folyamatok ismételt beküldését az ON CONFLICT nyeli el. Helyben pl.:
+    docker run -e POSTGRES_PASSWORD=pw -p 5432:5432 postgres
+    """
+
+    def __init__(self, dsn: str):
+        try:
+            import psycopg
+        except ImportError as exc:
+            raise RuntimeError("A PostgreSQL háttértárhoz a psycopg csomag kell "
+                               "(pip install 'psycopg[binary]').") from exc
+        self.dsn = dsn
+        self._psycopg = psycopg
+        self._lock = threading.Lock()
+        self._conn = psycopg.connect(dsn, autocommit=True)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " seq BIGSERIAL PRIMARY KEY,"
+            " rid TEXT UNIQUE,"
+            " submitted_at TEXT,"
+            " payload JSONB NOT NULL)"
+        )
+        self._rids = {rid for (rid,) in self._conn.execute(
+            "SELECT rid FROM responses WHERE rid IS NOT NULL")}
+        self.duplicates = 0
+
+    def has_rid(self, rid) -> bool:
+        return rid in self._rids
+
+    def append(self, row: dict) -> int:
+        return self.append_many([row])
+
+    def append_many(self, rows) -> int:
+        rids, submitted, payloads = [], [], []
+        for row in rows:
+            flat = flatten_row(row)
+            rid = flat.get("rid")
+            if rid is not None and (rid in self._rids or rid in rids):
+                self.duplicates += 1
+                continue
+            rids.append(rid)
+            submitted.append(flat.get("submitted_at"))
+            payloads.append(json.dumps(flat, ensure_ascii=False, default=str))
+        if not rids:
+            return 0
+        with self._lock:
+            # egyetlen utasítás, egy kör a szerverig: a tömbök soronként bontva
+            cur = self._conn.execute(
+                "INSERT INTO responses (rid, submitted_at, payload)"
+                " SELECT * FROM unnest(%s::text[], %s::text[], %s::jsonb[])"
+                " ON CONFLICT (rid) DO NOTHING RETURNING rid",
+                (rids, submitted, payloads),
+            )
+            inserted = len(cur.fetchall())
+        self.duplicates += len(rids) - inserted
+        self._rids.update(r for r in rids if r is not None)
+        return inserted
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def iter_rows(self, after_seq: int = 0):
+        # külön kapcsolat és szerveroldali kurzor: nagy táblánál sem tölt be mindent
+        with self._psycopg.connect(self.dsn) as conn:
+            with conn.cursor(name="iter_rows") as cur:
+                cur.execute("SELECT seq, payload FROM responses WHERE seq > %s ORDER BY seq",
+                            (after_seq,))
+                for seq, payload in cur:
+                    yield seq, payload if isinstance(payload, dict) else json.loads(payload)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class _file_lock:
+    """Folyamatok közötti kizárólagos zár egy segédfájlon (POSIX: flock, Windows: msvcrt)."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def __enter__(self):
+        self._fh = open(self.path, "a+b")
+        try:
+            import fcntl
+            fcntl.flock(self._fh, fcntl.LOCK_EX)
+        except ImportError:
+            import msvcrt
+            self._fh.seek(0)
+            msvcrt.locking(self._fh.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            import fcntl
+            fcntl.flock(self._fh, fcntl.LOCK_UN)
+        except ImportError:
+            import msvcrt
+            self._fh.seek(0)
+            msvcrt.locking(self._fh.fileno(), msvcrt.LK_UNLCK, 1)
+        self._fh.close()
+
+
+def open_store(url=DB_PATH):
+    """Háttértár URL vagy útvonal alapján.
+
+    - postgresql://user:pw@host/db  → PostgresStore
+    - sqlite:///utvonal (abszolút: sqlite:////utvonal), bármi más → ResponseStore (SQLite, WAL)
+    - xlsx:///utvonal, *.xlsx       → XlsxStore (régi, teljes újraírás)
+    """
+    url = str(url)
+    if url.startswith(("postgresql://", "postgres://")):
+        return PostgresStore(url)
+    if url.startswith("xlsx:///"):
+        return XlsxStore(url[len("xlsx:///"):])
+    if url.startswith("sqlite:///"):
+        return ResponseStore(url[len("sqlite:///"):])
+    if url.lower().endswith(".xlsx"):
+        return XlsxStore(url)
+    return ResponseStore(url)
+
+
+def import_legacy_xlsx(store, path=LEGACY_XLSX_PATH, batch_size: int = 500) -> int:
+    """A régi responses.xlsx sorainak egyszeri átvétele a tárba; visszaadja a beírt sorok számát.
+
+    rid szerint idempotens (append_many). Sikeres átvétel után egy "<név>.imported" jelzőfájl
+    készül, így a fájl csak egyszer olvasódik be; maga az XLSX érintetlen marad. Több folyamat
+    közül egyszerre csak egy végzi (fájlzár); hiba esetén a következő indítás újrapróbálja.
+    """
+    path = Path(path)
+    marker = path.with_name(path.name + ".imported")
+    if isinstance(store, XlsxStore) or not path.exists() or marker.exists():
+        return 0
+    with _file_lock(path.with_name(path.name + ".import.lock")):
+        if marker.exists():
+            return 0  # egy másik folyamat közben átvette
+        inserted = total = 0
+        batch = []
+        for _, row in _read_xlsx(path):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                inserted += store.append_many(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            inserted += store.append_many(batch)
+            total += len(batch)
+        marker.write_text(f"{time.strftime('%Y-%m-%dT%H:%M:%S')} {inserted} / {total} sor átvéve\n",
+                          encoding="utf-8")
+    log.info("A régi %s átvéve: %d új sor (%d a fájlban)", path, inserted, total)
+    return inserted
+
+
+_STOP = object()
+
+
+class SeqCursor:
+    """Növekményes olvasás egy tárból úgy, hogy egyetlen sor se maradjon ki.
+
+    PostgreSQL-ben a BIGSERIAL sorszám a beszúráskor dől el, nem a commitkor: két párhuzamos
+    folyamat közül a 11-es sor láthatóvá válhat a 10-es előtt, és egy `seq > utolsó` olvasó
+    a 10-est örökre átugraná. A kurzor ezért a legkisebb még hiányzó seq alól olvas újra, és
+    minden sort egyszer ad ki. Egy hézag legfeljebb `grace_s` másodpercig vár: az ütköző
+    (ON CONFLICT) vagy visszagörgetett beszúrás sorszáma sosem töltődik be. SQLite-ban
+    (egy író, commit-sorrend = seq-sorrend) a hézag ritka, ugyanígy működik.
+    """
+
+    def __init__(self, grace_s: float = 60):
+        self.grace_s = grace_s
+        self.low = 0        # eddig a seq-ig minden feldolgozva (vagy a hézag feladva)
+        self.top = 0        # a legnagyobb kiadott seq
+        self._seen = set()  # low fölött már kiadott seq-ek
+        self._gaps = {}     # hiányzó seq -> mikor vettük észre (monotonic)
+
+    def read(self, store):
+        """A legutóbbi olvasás óta láthatóvá vált sorok, (seq, sor) párokként."""
+        now = time.monotonic()
+        for seq, row in store.iter_rows(after_seq=self.low):
+            if seq in self._seen:
+                continue
+            for missing in range(self.top + 1, seq):
+                self._gaps[missing] = now
+            self._gaps.pop(seq, None)
+            self._seen.add(seq)
+            self.top = max(self.top, seq)
+            yield seq, row
+        for seq in [s for s, t in self._gaps.items() if now - t > self.grace_s]:
+            del self._gaps[seq]
+        self.low = min(self._gaps) - 1 if self._gaps else self.top
+        self._seen = {s for s in self._seen if s > self.low}
+
+
+class ResponseWriter:
+    """Folyamatszintű író szál sorral és csoportos commit-tal.
+
+    A `submit` azonnal visszatér; a szál az egy `batch_window` másodpercen belül
+    érkező sorokat egyetlen tranzakcióban írja ki. Leállításkor (atexit) a sorban
+    maradt elemeket még kiírja. A már mentett vagy sorban álló rid-ek ismételt
+    beküldését azonnal elnyeli. Ha egy csomag `retries` próbálkozás (exponenciális
+    várakozással) után sem írható ki, a sorai a `fallback` naplóba kerülnek (fsync),
+    és a következő induláskor újra a tárba íródnak – a sor nem vész el.
+    """
+
+    def __init__(self, store, batch_window: float = 0.05,
+                 max_batch: int = 500, retries: int = 6, fallback=FALLBACK_PATH):
+        self.store = store
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.retries = retries
+        self.fallback = Path(fallback)
+        self.failed = 0  # a tárba nem írt (a tartalék naplóba került) sorok száma
+        self.commit_failures = 0  # sikertelen commit-próbálkozások
+        self.on_commit = None  # opcionális mérés: on_commit(másodperc, sikeres-e)
+        self.replay_fallback()
+        self._queue = queue.Queue()
+        self._pending = set()  # sorban álló, még nem mentett rid-ek
+        self._pending_lock = threading.Lock()
+        self._duplicates = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="response-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, row: dict) -> bool:
+        """Sor beállítása az írási sorba (nem blokkol fájl-I/O-n).
+
+        Ha a rid már mentve van vagy sorban áll, nem csinál semmit és False-t ad vissza.
+        """
+        if self._closed:
+            raise RuntimeError("A válasz-író már le van állítva.")
+        rid = row.get("rid")
+        if rid is not None:
+            with self._pending_lock:
+                if rid in self._pending or self.store.has_rid(rid):
+                    self._duplicates += 1
+                    return False
+                self._pending.add(rid)
+        self._queue.put(row)
+        return True
+
+    @property
+    def backlog(self) -> int:
+        """Mentésre váró sorok száma."""
+        return self._queue.qsize()
+
+    @property
+    def duplicates(self) -> int:
+        """Elnyelt ismételt beküldések száma (író + tár szinten együtt)."""
+        return self._duplicates + self.store.duplicates
+
+    def flush(self):
+        """Megvárja, amíg minden eddig beküldött sor kiíródik."""
+        self._queue.join()
+
+    def close(self):
+        """Leállítás: a sorban maradt sorok kiírása, majd a szál befejezése."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+            self._commit(batch)
+            with self._pending_lock:
+                self._pending.difference_update(row.get("rid") for row in batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _commit(self, batch):
+        for attempt in range(1, self.retries + 1):
+            t0 = time.perf_counter()
+            try:
+                self.store.append_many(batch)
+                self._observe(t0, True)
+                return
+            except Exception:
+                self._observe(t0, False)
+                self.commit_failures += 1
+                log.exception("Mentési hiba (%d/%d. próbálkozás)", attempt, self.retries)
+                if attempt < self.retries:
+                    time.sleep(min(0.1 * 2 ** (attempt - 1), 5))  # 0.1, 0.2, ... 1.6 s
+        self.failed += len(batch)
+        self._journal(batch)
+
+    def _observe(self, t0, ok):
+        if self.on_commit is not None:
+            try:
+                self.on_commit(time.perf_counter() - t0, ok)
+            except Exception:
+                log.exception("A commit mérése sikertelen")  # a mentést nem akaszthatja meg
+
+    def _journal(self, rows):
+        """A nem mentett sorok tartós hozzáfűzése a tartalék naplóhoz (egy write + fsync)."""
+        data = "".join(json.dumps(row, ensure_ascii=False, default=str) + "\n" for row in rows)
+        try:
+            fd = os.open(self.fallback, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, data.encode("utf-8"))
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            log.error("%d sor a tartalék naplóba került: %s", len(rows), self.fallback)
+        except OSError:
+            # végső eset: legalább a naplóban maradjon nyoma
+            log.exception("A tartalék napló sem írható")
+            for row in rows:
+                log.error("Nem mentett sor: %s", json.dumps(row, ensure_ascii=False, default=str))
+
+    def replay_fallback(self) -> int:
+        """A tartalék naplóban lévő sorok beírása a tárba (rid szerint idempotens).
+
+        A naplót előbb egy folyamatonként egyedi névre nevezi át, így a közben más
+        folyamat által hozzáfűzött sorok nem vesznek el; ami most sem írható, visszakerül.
+        """
+        if not self.fallback.exists():
+            return 0
+        claimed = self.fallback.with_name(f"{self.fallback.name}.{os.getpid()}.replay")
+        try:
+            os.replace(self.fallback, claimed)
+        except FileNotFoundError:
+            return 0  # egy másik folyamat már átvette
+        rows = []
+        with open(claimed, encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    if line.strip():  # félbeszakadt írás: csak a naplóba
+                        log.error("Olvashatatlan tartaléksor: %s", line.rstrip())
+        try:
+            inserted = self.store.append_many(rows)
+        except Exception:
+            log.exception("A tartalék napló visszajátszása sikertelen")
+            self._journal(rows)
+            inserted = 0
+        claimed.unlink()
+        log.info("Tartalék napló visszajátszva: %d / %d sor", inserted, len(rows))
+        return inserted
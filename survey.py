@@ -0,0 +1,395 @@
+# survey.py — a kérdőív deklaratív leírása (oldalak, kérdések, válaszlehetőségek)
+# - egyszer, a folyamat indulásakor épül fel és ellenőrződik; minden munkamenet ezt használja
+# - nincs benne Streamlit: a kiértékelő / export eszközök is importálhatják
+# - a megjelenítés az appúj.py általános renderelőjében van (PAGES[page] → O(1))
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+TOTAL_PAGES = 19  # 0..18, a 19. a köszönőoldal
+GROUPS = ("text", "visual")  # kísérleti csoportok: szöveges / képes ajánlatok
+
+# ---------- ANYAGOK (ajánlatok + skálák) ----------
+TEXT_OFFERS = {
+    "Prága":"""Egy 4 napos prágai utazást ajánlok Önnek, amely 3 éjszaka szállást tartalmaz egy belvárosi hotelben, reggelivel.  
+Az út során idegenvezető kíséretében fedezheti fel a Károly hidat, az Óváros teret és a prágai vár történelmi utcáit.  
+**Az ajánlat ára: 129 900 Ft/fő.**""",
+    "Barcelona":"""Ajánlok Önnek egy 4 napos barcelonai városlátogatást, amely 3 éjszakás szállást biztosít egy tengerpart közeli, 4 csillagos hotelben, reggelivel.  
+Az utazás során megcsodálhatja Gaudí ikonikus alkotásait, köztük a Sagrada Famíliát és a Güell parkot, valamint átélheti a mediterrán város vibráló hangulatát.  
+**Az ajánlat ára: 159 900 Ft/fő.**""",
+    "Róma":"""Szívesen ajánlok Önnek egy 4 napos római kirándulást, amely 3 éjszakás szállást tartalmaz egy központi elhelyezkedésű hotelben, reggelivel.  
+Az ajánlat része a belépő a Colosseumba és a Vatikáni Múzeumokba, így közvetlen közelről élheti át az örök város kulturális kincseit.  
+**Az ajánlat ára: 134 900 Ft/fő.**""",
+}
+
+IMAGES = {
+    # a képek az app.py-val EGY mappában legyenek (ékezet NÉLKÜL!)
+    "Prága": "praga.png",
+    "Barcelona": "barcelona.png",
+    "Róma": "roma.png",
+}
+
+CAPTIONS = {
+    "Prága": "Prága – 129 900 Ft/fő · 4 nap · Kulturális élmény",
+    "Barcelona": "Barcelona – 159 900 Ft/fő · 4 nap · Mediterrán élmény",
+    "Róma": "Róma – 134 900 Ft/fő · 4 nap · Történelmi élmény",
+}
+
+DECISION_FACTORS = [
+    "Az ajánlat ára",
+    "A város iránti kíváncsiságom",
+    "Korábbi pozitív élményeim a helyszínnel",
+    "Ismerőseim véleménye",
+    "Az ajánlat szövegének stílusa",
+    "A kép vizuális minősége",
+    "Az ajánlat platformja (ahol megjelent)",
+    "Az, hogy mesterséges intelligencia generálta-e",
+    "Távolság / utazás kényelme",
+    "Biztonsági szempontok",
+    "Időjárás / évszak",
+    "Saját pénzügyi helyzetem",
+    "Egyéb személyes szempont",
+]
+
+EXPERIENCE_ITEMS = [
+    "Mennyire érezte hitelesnek az ajánlatokat?",
+    "Mennyire volt könnyű megérteni a szövegeket/képeket?",
+    "Mennyire tűntek megbízhatónak az ajánlatok?",
+    "Mennyire volt kellemes az élmény?",
+    "Mennyire érezte személyre szabottnak az ajánlatokat?",
+    "Mennyire érezte, hogy a mesterséges intelligencia jól tudja, mi érdekli?",
+]
+
+AI_TRUST = [
+    "Általában bízom az MI által generált tartalmakban.",
+    "Az MI ajánlásai hasznosak számomra.",
+    "Az MI gyakran félrevezető információt ad. (fordított tétel)",
+    "Szívesen hozok döntést MI-ajánlások alapján.",
+]
+
+PERSUASION_KNOWLEDGE = [
+    "Könnyen felismerem, ha egy ajánlat marketing célból készült.",
+    "Gyorsan észreveszem, ha valami túl szép ahhoz, hogy igaz legyen.",
+    "Általában átlátok a reklámokon.",
+]
+
+MANIP_CHECK = [
+    "Az értékeléskor figyelmen kívül hagytam az árat.",
+    "Megértettem, hogy a tartalmakat MI generálta / állíthatta elő.",
+]
+
+DEMOGRAPHICS = {
+    "Nem": ["Nő", "Férfi", "Egyéb", "Nem szeretnék válaszolni"],
+    "Életkor": ["18-24", "25-34", "35-44", "45-54", "55+"],
+    "Legmagasabb iskolai végzettség": [
+        "Középiskola",
+        "Főiskola / Egyetem (BA/BSc)",
+        "Mesterképzés (MA/MSc)",
+        "PhD / DLA",
+    ],
+}
+
+EXPERIENCE_QS = [
+    "Biztos voltam abban, hogy jó döntést hoztam.",
+    "Megkönnyebbülést éreztem a választás után.",
+    "Nyugodtnak éreztem magam a döntés közben.",
+    "Úgy éreztem, hogy a döntés az én kezemben van.",
+]
+
+CONFIRMATION_QS = [
+    "A döntés után is gondolkodtam, vajon helyesen választottam-e.",
+    "Szerettem volna, ha valaki megerősíti, hogy jól döntöttem.",
+    "Úgy éreztem, szívesen megosztanám másokkal a választásomat.",
+]
+
+CONFIRMATION_SEEKING_QS = [
+    "Vásárlás után kérem mások véleményét, hogy jól döntöttem-e.",
+    "Fontos számomra, hogy a környezetem jóváhagyja a vásárlási döntéseimet.",
+    "Bizonytalan helyzetben inkább megvárom, mit mondanak mások a termékről.",
+    "Gyakran hasonlítom össze a választásomat az ismerőseim döntéseivel.",
+]
+
+RESPONSIBILITY_QS = [
+    "Ha egy termék nem válik be, magamat hibáztatom a rossz döntésért.",
+    "Vásárláskor gyakran inkább mások vagy egy rendszer javaslataira támaszkodom, nem a saját megérzésemre. (fordított tétel)",
+    "Az elégedettségem vagy csalódásom a vásárlásaimnál az én döntésem következménye.",
+]
+
+MAXIMIZATION_QS = [
+    "Vásárlás előtt több különböző terméket is össze szoktam hasonlítani.",
+    "Fontos számomra, hogy minden lehetséges alternatívát megvizsgáljak.",
+    "Sok időt töltök azzal, hogy más opciókat is mérlegeljek.",
+    "Gyakran átnézek több weboldalt vagy boltot, mielőtt döntök.",
+    "Általában nem elégszem meg az első javasolt lehetőséggel. (fordított tétel)",
+]
+
+AIAS_QS = [
+    "Úgy gondolom, hogy a mesterséges intelligencia javítani fogja az életemet.",
+    "Úgy gondolom, hogy a mesterséges intelligencia javítani fogja a munkámat.",
+    "Úgy gondolom, hogy a jövőben használni fogok mesterséges intelligencia alapú technológiát.",
+    "Úgy gondolom, hogy a mesterséges intelligencia összességében pozitív az emberiség számára.",
+]
+
+LIKERT = tuple(range(1, 11))
+LIKERT_CAPTION = ("Kérjük, értékelje az alábbi állításokat egy 1-től 10-ig terjedő skálán, "
+                  "ahol az 1 = egyáltalán nem értek egyet, a 10 = teljes mértékben egyetértek.")
+FREQ_OPTS = ("Soha", "Ritkán (évente 1–2 alkalom)", "Havonta", "Hetente", "Hetente többször")
+
+
+# ---------- LEÍRÓ TÍPUSOK ----------
+@dataclass(frozen=True)
+class Item:
+    """Egy kérdés: rövid azonosító, widget-kulcs, felirat és lehetőségek."""
+    key: str                       # Streamlit widget-kulcs (egyedi)
+    label: str                     # a megjelenő kérdés (csak megjelenítéskor / exportkor kell)
+    id: Optional[str] = None       # rövid, stabil azonosító = oszlopnév (alapból a widget-kulcs)
+    group: Optional[str] = None    # kérdésblokk / skála, amelyhez a tétel tartozik
+    options: tuple = LIKERT
+    widget: str = "radio"          # radio | slider | text_area
+    horizontal: bool = True
+    index: Optional[int] = None    # radio alapértelmezett indexe (None = nincs kiválasztva)
+    default: Optional[int] = None  # slider alapértéke
+    required: bool = True
+    section: Optional[str] = None  # alcím az oldalon belül
+
+    def __post_init__(self):
+        if self.id is None:
+            object.__setattr__(self, "id", self.key)
+
+
+@dataclass(frozen=True)
+class Page:
+    """Egy oldal: típus (renderelő), szövegek, kérdések, navigáció és extra ellenőrzés."""
+    number: int
+    kind: str                      # consent | instructions | offer | questions
+    header: str = ""
+    intro: str = ""
+    caption: str = ""
+    items: tuple = ()
+    offer: Optional[str] = None    # ajánlat oldalaknál a város
+    offer_title: str = ""
+    prev: Optional[int] = None
+    next: Optional[int] = None
+    validate: Optional[Callable[[dict], list]] = None  # {item.key: érték} → hibaüzenetek
+
+
+def _likert(keys_prefix, id_prefix, questions, group):
+    return tuple(Item(key=f"{keys_prefix}{i}", label=q, id=f"{id_prefix}_{i + 1}", group=group)
+                 for i, q in enumerate(questions))
+
+
+def _validate_decision(values: dict) -> list:
+    errs = []
+    choice, count = values.get("decision_choice"), values.get("decision_count")
+    if choice not in (None, "Egyiket sem") and count == 0:
+        errs.append("A választott ajánlatnak szerepelnie kell az elfogadhatók között.")
+    if choice == "Egyiket sem" and count not in (None, 0):
+        errs.append("Ha „Egyiket sem”-et választ, az elfogadhatók száma 0 kell legyen.")
+    return errs
+
+
+def _validate_consent(values: dict) -> list:
+    if values.get("consent_0") != "Igen":
+        return ["A kérdőív folytatásához szükség van a hozzájárulásra."]
+    return []
+
+
+# ---------- OLDALAK ----------
+_PAGES = (
+    Page(0, "consent",
+         header="🧭 MI-ajánlások a fogyasztói döntésekben",
+         intro="""
+    Kedves Kitöltő!
+
+    Budai Katalin vagyok, a Budapesti Gazdaságtudományi Egyetem pénzügy-számvitel alapszakos hallgatója.
+    Ez a kérdőív a Tudományos Diákköri Konferenciára készülő kutatásom része, amelyben azt vizsgálom,
+    hogyan befolyásolhatja a mesterséges intelligencia a fogyasztói döntéshozatalt.
+
+    A kitöltés körülbelül 8-10 percet vesz igénybe, és nagy segítséget jelent számomra.
+    Még nagyobb támogatás, ha a kérdőívet másoknak is továbbítja, mert minél több válaszra van szükségem
+    a kutatás sikeres megvalósításához.
+
+    Előre is köszönöm a segítségét és közreműködését!
+    """,
+         items=(Item("consent_0", "Hozzájárulok a névtelen válaszaim kutatási célú felhasználásához.",
+                     id="consent", options=("Igen", "Nem"), horizontal=False, required=False,
+                     section="Beleegyezés"),),
+         next=1, validate=_validate_consent),
+
+    Page(1, "instructions", header="Instrukciók",
+         intro="A következő oldalakon MI által javasolt utazási ajánlatokat lát. "
+               "Kérjük, olvassa el / nézze meg, majd válaszoljon a kérdésekre.\n\n"
+               "⚠️ A döntése során **ne vegye figyelembe az árat** – ezt külön is ellenőrizzük.",
+         next=2),
+
+    Page(2, "offer", header="Ajánlat 1/3", offer="Prága", offer_title="Prága – Kulturális élmény", prev=1, next=3),
+    Page(3, "offer", header="Ajánlat 2/3", offer="Barcelona", offer_title="Barcelona – Mediterrán élmény", prev=2, next=4),
+    Page(4, "offer", header="Ajánlat 3/3", offer="Róma", offer_title="Róma – Történelmi élmény", prev=3, next=5),
+
+    # 5. oldal: Döntés
+    Page(5, "questions", header="2. Döntés",
+         items=(
+             Item("decision_choice", "Melyik ajánlatot fogadná el?",
+                  options=("Prága", "Barcelona", "Róma", "Egyiket sem"), horizontal=False),
+             Item("decision_count", "Összesen hány ajánlatot tartott elfogadhatónak?",
+                  options=(0, 1, 2, 3), horizontal=False),
+         ),
+         prev=4, next=6, validate=_validate_decision),
+
+    # 6. oldal: Befolyásoló tényezők (csúszkák, mindig van értékük)
+    Page(6, "questions", header="Mi befolyásolta a döntését?",
+         intro="Az alábbi kérdések arra vonatkoznak, hogyan élte meg a döntés meghozatalát, "
+               "és hogyan viszonyul az utólagos következményekhez. "
+               "Kérjük, értékelje az állításokat az adott skálán!",
+         caption=LIKERT_CAPTION,
+         items=tuple(Item(f"factor_{i}", q, id=f"factor_{i + 1}", group="factors", widget="slider", default=5)
+                     for i, q in enumerate(DECISION_FACTORS)),
+         prev=5, next=7),
+
+    # 7. oldal: Döntési élmény
+    Page(7, "questions", header="Döntési élmény", caption=LIKERT_CAPTION,
+         items=_likert("exp_", "exp", EXPERIENCE_QS, "experience"), prev=6, next=8),
+
+    # 8. oldal: Élménykérdések
+    Page(8, "questions", header="Élményre vonatkozó kérdések",
+         intro="Az alábbi kérdések arra vonatkoznak, milyen élmény volt a döntési folyamat számára. ",
+         caption=LIKERT_CAPTION,
+         items=_likert("conf7_", "conf", CONFIRMATION_QS, "confirmation"), prev=7, next=9),
+
+    # 9. oldal: Megerősítéskeresés
+    Page(9, "questions", header="Megerősítéskeresés",
+         intro="Az alábbi kérdések arra vonatkoznak, mennyire igényel megerősítést a döntései után. ",
+         caption=LIKERT_CAPTION,
+         items=_likert("conf8_", "seek", CONFIRMATION_SEEKING_QS, "confirmation_seeking"), prev=8, next=10),
+
+    # 10. oldal: Felelősségérzet
+    Page(10, "questions", header="Felelősségérzet",
+         intro="Az alábbi kérdések arra vonatkoznak, mennyire érzi magát felelősének a döntései után. ",
+         caption=LIKERT_CAPTION,
+         items=_likert("conf_", "resp", RESPONSIBILITY_QS, "responsibility"), prev=9, next=11),
+
+    # 11. oldal: Hogyan hatott Önre az MI-ajánlás?
+    Page(11, "questions", header="Hogyan hatott Önre az MI-ajánlás a döntése során?",
+         items=(Item("ai_influence", "Kérjük, válassza ki az Önre leginkább jellemző állítást:", horizontal=False,
+                     options=("Egyáltalán nem vettem figyelembe az ajánlást",
+                              "Az ajánlás egybeesett azzal, amit magamtól is választottam volna",
+                              "Az ajánlás új szempontot adott, amit figyelembe vettem",
+                              "Az ajánlás teljesen megváltoztatta a döntésemet")),),
+         prev=10, next=12),
+
+    # 12. oldal: Manipuláció-ellenőrzés + figyelmi próba
+    Page(12, "questions", header="Ellenőrző kérdések",
+         caption="Az alábbi kérdések arra szolgálnak, hogy ellenőrizzük a figyelmet és a válaszok következetességét.",
+         items=tuple(Item(f"mc_{i}", q, id=f"mc_{i + 1}", group="manip_check", index=0,
+                          section="Manipuláció-ellenőrzés")
+                     for i, q in enumerate(MANIP_CHECK))
+         + (Item("attention_check", "Válassza a **harmadik** opciót!",
+                 options=("Első", "Második", "Harmadik", "Negyedik"), horizontal=False,
+                 section="Figyelmi próba"),),
+         prev=11, next=13),
+
+    # 13. oldal: Alternatívák mérlegelése
+    Page(13, "questions", header="Alternatívák mérlegelése",
+         intro="Az alábbi kérdések arra vonatkoznak, mennyire mérlegeli a különböző lehetőségeket döntés előtt.",
+         caption=LIKERT_CAPTION,
+         items=_likert("max_", "max", MAXIMIZATION_QS, "maximization"), prev=12, next=14),
+
+    # 14. oldal: Nyitott kérdés
+    Page(14, "questions", header="Nyitott kérdés",
+         intro="Kérem, írja le röviden, mi volt az a legfontosabb szempont, ami alapján végül az adott ajánlatot választotta.",
+         items=(Item("choice_reason", "Válasza:", widget="text_area",
+                     options=(), required=False),),
+         prev=13, next=15),
+
+    # 15. oldal: Vásárlási gyakoriság
+    Page(15, "questions", header="Vásárlási gyakoriság",
+         caption="Kérem, jelölje, milyen gyakran vásárol az alábbi módokon.",
+         items=(
+             Item("freq_online", "Milyen gyakran vásárol online (pl. webshopban, alkalmazáson keresztül)?",
+                  group="frequency", options=FREQ_OPTS, horizontal=False),
+             Item("freq_offline", "Milyen gyakran vásárol személyesen (pl. boltban, üzletben)?",
+                  group="frequency", options=FREQ_OPTS, horizontal=False),
+             Item("freq_ai", "Milyen gyakran használ mesterséges intelligencia eszközt (pl. chatbotot, ajánlórendszert) vásárlásai során?",
+                  group="frequency", options=FREQ_OPTS, horizontal=False),
+         ),
+         prev=14, next=16),
+
+    # 16. oldal: AIAS-4 skála
+    Page(16, "questions", header="AIAS-4 skála",
+         intro="Az alábbi kérdések azt vizsgálják, hogyan látja a mesterséges intelligencia jövőbeli hatásait.",
+         caption=LIKERT_CAPTION,
+         items=_likert("aias_", "aias", AIAS_QS, "aias"), prev=15, next=17),
+
+    # 17. oldal: Mesterséges intelligencia használata
+    Page(17, "questions", header="Mesterséges intelligencia használata",
+         items=(
+             Item("ai_use", "Használja Ön a mindennapokban mesterséges intelligencia alapú eszközöket (pl. ChatGPT, ajánlórendszerek, chatbotok)?", options=("Igen", "Nem"), horizontal=False),
+             Item("ai_freq", "Milyen gyakran használ mesterséges intelligenciát?", options=("Soha", "Ritkán", "Havonta", "Hetente", "Hetente többször"),
+                  horizontal=False, required=False),  # az eredetiben csak az ai_use kötelező
+         ),
+         prev=16, next=18),
+
+    # 18. oldal: Demográfiai kérdések
+    Page(18, "questions", header="Demográfiai kérdések",
+         items=(
+             Item("demo_gender", "Kérjük, jelölje a nemét:", group="demographics",
+                  options=("Férfi", "Nő", "Egyéb / nem szeretném megadni"), horizontal=False),
+             Item("demo_age", "Kérjük, adja meg az életkorát:", group="demographics",
+                  options=("18–24 év", "25–34 év", "35–44 év", "45–54 év", "55 év vagy idősebb"),
+                  horizontal=False),
+             Item("demo_edu", "Kérjük, adja meg a legmagasabb iskolai végzettségét:", group="demographics",
+                  options=("Középiskola", "Felsőfokú tanulmányok folyamatban",
+                           "Egyetemi / főiskolai diploma", "Posztgraduális végzettség"),
+                  horizontal=False),
+             Item("demo_job", "Kérjük, jelölje a foglalkozását / státuszát:", group="demographics",
+                  options=("Tanuló / hallgató", "Dolgozó alkalmazottként", "Vállalkozó",
+                           "Munkanélküli", "Egyéb"),
+                  horizontal=False),
+             Item("demo_residence", "Kérjük, jelölje a lakóhelyének típusát:", group="demographics",
+                  options=("Főváros", "Megyeszékhely", "Egyéb város", "Község"), horizontal=False),
+         ),
+         prev=17, next=TOTAL_PAGES),
+)
+
+RENDER_KINDS = {"consent", "instructions", "offer", "questions"}
+WIDGETS = {"radio", "slider", "text_area"}
+
+
+def compile_survey(pages=_PAGES) -> tuple:
+    """Ellenőrzi a leírást, és oldalszám szerint indexelhető tuple-t ad vissza.
+
+    Hibás leírás (hiányzó / ugráló oldalszám, ütköző kulcs vagy azonosító, rossz
+    navigáció) esetén ValueError – így a hiba már induláskor kiderül, nem kitöltés közben.
+    """
+    if [p.number for p in pages] != list(range(TOTAL_PAGES)):
+        raise ValueError("Az oldalszámoknak 0-tól folyamatosan kell növekedniük.")
+    keys, ids = set(), set()
+    for p in pages:
+        if p.kind not in RENDER_KINDS:
+            raise ValueError(f"{p.number}. oldal: ismeretlen oldaltípus: {p.kind!r}")
+        if p.kind == "offer" and p.offer not in TEXT_OFFERS:
+            raise ValueError(f"{p.number}. oldal: ismeretlen ajánlat: {p.offer!r}")
+        for target in (p.prev, p.next):
+            if target is not None and not 0 <= target <= TOTAL_PAGES:
+                raise ValueError(f"{p.number}. oldal: érvénytelen navigációs cél: {target}")
+        for it in p.items:
+            if it.key in keys:
+                raise ValueError(f"{p.number}. oldal: ismétlődő widget-kulcs: {it.key!r}")
+            keys.add(it.key)
+            if it.id in ids:
+                raise ValueError(f"{p.number}. oldal: ismétlődő tétel-azonosító: {it.id!r}")
+            ids.add(it.id)
+            if len(it.options) > 127:
+                raise ValueError(f"{it.id}: túl sok válaszlehetőség (int8 kód)")
+            if it.widget not in WIDGETS:
+                raise ValueError(f"{it.key}: ismeretlen widget: {it.widget!r}")
+            if it.widget != "text_area" and not it.options:
+                raise ValueError(f"{it.key}: nincsenek válaszlehetőségek")
+    return tuple(pages)
+
+
+PAGES = compile_survey()
+
+# minden tétel kitöltési sorrendben; az azonosító → pozíció index a tömör válasz-tárolóhoz
+ITEMS = tuple(it for p in PAGES for it in p.items)
+ITEM_INDEX = {it.id: i for i, it in enumerate(ITEMS)}
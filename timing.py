@@ -0,0 +1,56 @@
+# timing.py — oldalankénti időmérés munkamenetenként
+# - monoton, nanoszekundumos óra (time.monotonic_ns): nincs óraállítás- és szövegparszolás-gond
+# - kompakt tárolás: oldalanként egy-egy egész szám tömbben (tartózkodási idő, látogatás, rerun)
+# - Vissza / Tovább esetén a tartózkodási idő összeadódik, nem íródik felül
+
+import time
+from array import array
+
+
+class PageTimer:
+    """Egy munkamenet oldalidői: belépés / kilépés események, rerun- és látogatásszámlálók."""
+
+    __slots__ = ("dwell_ns", "visits", "reruns", "current", "entered_ns")
+
+    def __init__(self, n_pages: int):
+        self.dwell_ns = array("q", [0]) * n_pages  # oldalanként összesített idő
+        self.visits = array("l", [0]) * n_pages
+        self.reruns = array("l", [0]) * n_pages
+        self.current = -1  # még nincs megnyitott oldal
+        self.entered_ns = 0
+
+    def switch(self, page: int, now_ns: int = None):
+        """Oldalváltás: a régi oldal ideje lezárul, az új oldal látogatása kezdődik."""
+        now = time.monotonic_ns() if now_ns is None else now_ns
+        if self.current >= 0:
+            self.dwell_ns[self.current] += now - self.entered_ns
+        self.current = page
+        self.entered_ns = now
+        self.visits[page] += 1
+
+    def rerun(self, page: int):
+        """Minden szkriptfutáskor: rerun számlálása (és belépés, ha ez új oldal)."""
+        if page != self.current:
+            self.switch(page)
+        self.reruns[page] += 1
+
+    def durations(self) -> dict:
+        """Az összes duration_page_* érték egy menetben, másodpercben (2 tizedes)."""
+        return {f"duration_page_{p}": round(ns / 1e9, 2) for p, ns in enumerate(self.dwell_ns)}
+
+    def dump(self) -> bytes:
+        """Mentéshez (checkpoint): az összesített értékek bájtként; a nyitott látogatás nem."""
+        return self.dwell_ns.tobytes() + self.visits.tobytes() + self.reruns.tobytes()
+
+    @classmethod
+    def load(cls, data: bytes, n_pages: int):
+        """Visszatöltés: az összesített idők megmaradnak, a következő rerun új látogatást nyit."""
+        timer = cls(n_pages)
+        a = timer.dwell_ns.itemsize * n_pages
+        b = a + timer.visits.itemsize * n_pages
+        if len(data) != b + timer.reruns.itemsize * n_pages:
+            raise ValueError("A mentett időadatok mérete nem egyezik az oldalak számával.")
+        timer.dwell_ns = array("q", data[:a])
+        timer.visits = array("l", data[a:b])
+        timer.reruns = array("l", data[b:])
+        return timer